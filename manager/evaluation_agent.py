@@ -7,14 +7,12 @@ import asyncio
 import json
 import logging
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any
 from dataclasses import dataclass
 from enum import Enum
 
-import requests
 from google.cloud import firestore
-from google.cloud import aiplatform
-from vertexai.generative_models import GenerativeModel, Part
+from vertexai.generative_models import GenerativeModel
 import vertexai
 
 # Configure logging
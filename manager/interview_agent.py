@@ -6,8 +6,8 @@ AI agent for conducting voice interviews with startup founders
 import asyncio
 import json
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Tuple
+from datetime import datetime
+from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 from enum import Enum
 import uuid
@@ -67,6 +67,172 @@ class InterviewSession:
     key_insights: List[str]
     red_flags: List[str]
 
+# Structured interview framework shared by all interview agent instances
+INTERVIEW_STRUCTURE: Dict[InterviewSection, Dict[str, Any]] = {
+    InterviewSection.INTRODUCTION: {
+        "duration": 300,  # 5 minutes
+        "objectives": ["establish_rapport", "explain_process", "get_consent"],
+        "questions": [
+            InterviewQuestion(
+                section=InterviewSection.INTRODUCTION,
+                question="Thank you for joining us today. Before we begin, may I have your consent to record this conversation for evaluation purposes?",
+                follow_up_triggers=["consent", "recording"],
+                importance=5
+            ),
+            InterviewQuestion(
+                section=InterviewSection.INTRODUCTION,
+                question="Could you briefly introduce yourself and your role at the company?",
+                follow_up_triggers=["background", "role"],
+                importance=4
+            )
+        ]
+    },
+    
+    InterviewSection.FOUNDER_BACKGROUND: {
+        "duration": 900,  # 15 minutes
+        "objectives": ["assess_experience", "understand_motivation", "evaluate_domain_expertise"],
+        "questions": [
+            InterviewQuestion(
+                section=InterviewSection.FOUNDER_BACKGROUND,
+                question="Tell me about your journey that led to starting this company. What specific experiences prepared you for this venture?",
+                follow_up_triggers=["vague", "generic", "missing_details"],
+                importance=5
+            ),
+            InterviewQuestion(
+                section=InterviewSection.FOUNDER_BACKGROUND,
+                question="What specific experience do you have in this market or industry?",
+                follow_up_triggers=["no_experience", "limited_experience"],
+                importance=5
+            ),
+            InterviewQuestion(
+                section=InterviewSection.FOUNDER_BACKGROUND,
+                question="How did you first identify this problem? Was it through personal experience or market research?",
+                follow_up_triggers=["personal_experience", "market_research", "timing"],
+                importance=4
+            )
+        ]
+    },
+    
+    InterviewSection.PROBLEM_DEEP_DIVE: {
+        "duration": 900,  # 15 minutes
+        "objectives": ["validate_problem", "understand_market", "assess_urgency"],
+        "questions": [
+            InterviewQuestion(
+                section=InterviewSection.PROBLEM_DEEP_DIVE,
+                question="Walk me through the exact problem you're solving. Can you give me a specific example of how this problem manifests for your customers?",
+                follow_up_triggers=["vague_problem", "no_examples", "theoretical"],
+                importance=5
+            ),
+            InterviewQuestion(
+                section=InterviewSection.PROBLEM_DEEP_DIVE,
+                question="How are customers currently handling this problem? What's the cost of not solving it?",
+                follow_up_triggers=["no_current_solution", "cost_unclear"],
+                importance=5
+            ),
+            InterviewQuestion(
+                section=InterviewSection.PROBLEM_DEEP_DIVE,
+                question="How big is this market? Have you validated the market size through research or customer interviews?",
+                follow_up_triggers=["no_validation", "unrealistic_size"],
+                importance=4
+            )
+        ]
+    },
+    
+    InterviewSection.SOLUTION_VALIDATION: {
+        "duration": 900,  # 15 minutes
+        "objectives": ["assess_solution_fit", "understand_validation", "evaluate_traction"],
+        "questions": [
+            InterviewQuestion(
+                section=InterviewSection.SOLUTION_VALIDATION,
+                question="How does your solution uniquely address this problem? What makes it different from existing alternatives?",
+                follow_up_triggers=["not_unique", "unclear_differentiation"],
+                importance=5
+            ),
+            InterviewQuestion(
+                section=InterviewSection.SOLUTION_VALIDATION,
+                question="What validation have you done with actual customers? Can you share specific feedback or metrics?",
+                follow_up_triggers=["no_validation", "vague_metrics", "no_customers"],
+                importance=5
+            ),
+            InterviewQuestion(
+                section=InterviewSection.SOLUTION_VALIDATION,
+                question="What's your current traction? How many customers do you have and what's your growth rate?",
+                follow_up_triggers=["no_traction", "declining_growth", "unrealistic_projections"],
+                importance=4
+            )
+        ]
+    },
+    
+    InterviewSection.TEAM_DYNAMICS: {
+        "duration": 600,  # 10 minutes
+        "objectives": ["assess_team_strength", "understand_dynamics", "identify_gaps"],
+        "questions": [
+            InterviewQuestion(
+                section=InterviewSection.TEAM_DYNAMICS,
+                question="Tell me about your co-founders and key team members. What unique skills does each person bring?",
+                follow_up_triggers=["weak_team", "missing_skills", "no_cofounders"],
+                importance=4
+            ),
+            InterviewQuestion(
+                section=InterviewSection.TEAM_DYNAMICS,
+                question="How do you handle disagreements or conflicts within the team? Can you give me an example?",
+                follow_up_triggers=["poor_communication", "unresolved_conflicts"],
+                importance=3
+            ),
+            InterviewQuestion(
+                section=InterviewSection.TEAM_DYNAMICS,
+                question="What are the biggest skill gaps you need to fill in the next 12 months?",
+                follow_up_triggers=["no_awareness", "critical_gaps"],
+                importance=3
+            )
+        ]
+    },
+    
+    InterviewSection.BUSINESS_MODEL: {
+        "duration": 900,  # 15 minutes
+        "objectives": ["understand_monetization", "assess_scalability", "evaluate_metrics"],
+        "questions": [
+            InterviewQuestion(
+                section=InterviewSection.BUSINESS_MODEL,
+                question="How do you make money? Walk me through your revenue model and pricing strategy.",
+                follow_up_triggers=["unclear_model", "no_revenue", "unsustainable_pricing"],
+                importance=5
+            ),
+            InterviewQuestion(
+                section=InterviewSection.BUSINESS_MODEL,
+                question="What's your path to profitability? When do you expect to break even?",
+                follow_up_triggers=["no_path", "unrealistic_timeline"],
+                importance=4
+            ),
+            InterviewQuestion(
+                section=InterviewSection.BUSINESS_MODEL,
+                question="What are your key metrics and how are you currently performing against them?",
+                follow_up_triggers=["wrong_metrics", "poor_performance", "no_tracking"],
+                importance=4
+            )
+        ]
+    },
+    
+    InterviewSection.WRAP_UP: {
+        "duration": 300,  # 5 minutes
+        "objectives": ["summarize_key_points", "clarify_next_steps", "thank_participant"],
+        "questions": [
+            InterviewQuestion(
+                section=InterviewSection.WRAP_UP,
+                question="Is there anything important about your startup that we haven't covered today?",
+                follow_up_triggers=["new_information"],
+                importance=3
+            ),
+            InterviewQuestion(
+                section=InterviewSection.WRAP_UP,
+                question="What questions do you have about our investment process or evaluation criteria?",
+                follow_up_triggers=["process_questions"],
+                importance=2
+            )
+        ]
+    }
+}
+
 class StartupInterviewAgent:
     """AI agent for conducting structured interviews with startup founders"""
     
@@ -85,7 +251,7 @@ class StartupInterviewAgent:
         self.storage_client = storage.Client()
         
         # Interview configuration
-        self.interview_structure = self._initialize_interview_structure()
+        self.interview_structure = INTERVIEW_STRUCTURE
         self.current_section = InterviewSection.INTRODUCTION
         self.section_start_time = None
         
@@ -102,174 +268,6 @@ class StartupInterviewAgent:
             pitch=0.0
         )
     
-    def _initialize_interview_structure(self) -> Dict[InterviewSection, Dict[str, Any]]:
-        """Initialize the structured interview framework"""
-        
-        return {
-            InterviewSection.INTRODUCTION: {
-                "duration": 300,  # 5 minutes
-                "objectives": ["establish_rapport", "explain_process", "get_consent"],
-                "questions": [
-                    InterviewQuestion(
-                        section=InterviewSection.INTRODUCTION,
-                        question="Thank you for joining us today. Before we begin, may I have your consent to record this conversation for evaluation purposes?",
-                        follow_up_triggers=["consent", "recording"],
-                        importance=5
-                    ),
-                    InterviewQuestion(
-                        section=InterviewSection.INTRODUCTION,
-                        question="Could you briefly introduce yourself and your role at the company?",
-                        follow_up_triggers=["background", "role"],
-                        importance=4
-                    )
-                ]
-            },
-            
-            InterviewSection.FOUNDER_BACKGROUND: {
-                "duration": 900,  # 15 minutes
-                "objectives": ["assess_experience", "understand_motivation", "evaluate_domain_expertise"],
-                "questions": [
-                    InterviewQuestion(
-                        section=InterviewSection.FOUNDER_BACKGROUND,
-                        question="Tell me about your journey that led to starting this company. What specific experiences prepared you for this venture?",
-                        follow_up_triggers=["vague", "generic", "missing_details"],
-                        importance=5
-                    ),
-                    InterviewQuestion(
-                        section=InterviewSection.FOUNDER_BACKGROUND,
-                        question="What specific experience do you have in this market or industry?",
-                        follow_up_triggers=["no_experience", "limited_experience"],
-                        importance=5
-                    ),
-                    InterviewQuestion(
-                        section=InterviewSection.FOUNDER_BACKGROUND,
-                        question="How did you first identify this problem? Was it through personal experience or market research?",
-                        follow_up_triggers=["personal_experience", "market_research", "timing"],
-                        importance=4
-                    )
-                ]
-            },
-            
-            InterviewSection.PROBLEM_DEEP_DIVE: {
-                "duration": 900,  # 15 minutes
-                "objectives": ["validate_problem", "understand_market", "assess_urgency"],
-                "questions": [
-                    InterviewQuestion(
-                        section=InterviewSection.PROBLEM_DEEP_DIVE,
-                        question="Walk me through the exact problem you're solving. Can you give me a specific example of how this problem manifests for your customers?",
-                        follow_up_triggers=["vague_problem", "no_examples", "theoretical"],
-                        importance=5
-                    ),
-                    InterviewQuestion(
-                        section=InterviewSection.PROBLEM_DEEP_DIVE,
-                        question="How are customers currently handling this problem? What's the cost of not solving it?",
-                        follow_up_triggers=["no_current_solution", "cost_unclear"],
-                        importance=5
-                    ),
-                    InterviewQuestion(
-                        section=InterviewSection.PROBLEM_DEEP_DIVE,
-                        question="How big is this market? Have you validated the market size through research or customer interviews?",
-                        follow_up_triggers=["no_validation", "unrealistic_size"],
-                        importance=4
-                    )
-                ]
-            },
-            
-            InterviewSection.SOLUTION_VALIDATION: {
-                "duration": 900,  # 15 minutes
-                "objectives": ["assess_solution_fit", "understand_validation", "evaluate_traction"],
-                "questions": [
-                    InterviewQuestion(
-                        section=InterviewSection.SOLUTION_VALIDATION,
-                        question="How does your solution uniquely address this problem? What makes it different from existing alternatives?",
-                        follow_up_triggers=["not_unique", "unclear_differentiation"],
-                        importance=5
-                    ),
-                    InterviewQuestion(
-                        section=InterviewSection.SOLUTION_VALIDATION,
-                        question="What validation have you done with actual customers? Can you share specific feedback or metrics?",
-                        follow_up_triggers=["no_validation", "vague_metrics", "no_customers"],
-                        importance=5
-                    ),
-                    InterviewQuestion(
-                        section=InterviewSection.SOLUTION_VALIDATION,
-                        question="What's your current traction? How many customers do you have and what's your growth rate?",
-                        follow_up_triggers=["no_traction", "declining_growth", "unrealistic_projections"],
-                        importance=4
-                    )
-                ]
-            },
-            
-            InterviewSection.TEAM_DYNAMICS: {
-                "duration": 600,  # 10 minutes
-                "objectives": ["assess_team_strength", "understand_dynamics", "identify_gaps"],
-                "questions": [
-                    InterviewQuestion(
-                        section=InterviewSection.TEAM_DYNAMICS,
-                        question="Tell me about your co-founders and key team members. What unique skills does each person bring?",
-                        follow_up_triggers=["weak_team", "missing_skills", "no_cofounders"],
-                        importance=4
-                    ),
-                    InterviewQuestion(
-                        section=InterviewSection.TEAM_DYNAMICS,
-                        question="How do you handle disagreements or conflicts within the team? Can you give me an example?",
-                        follow_up_triggers=["poor_communication", "unresolved_conflicts"],
-                        importance=3
-                    ),
-                    InterviewQuestion(
-                        section=InterviewSection.TEAM_DYNAMICS,
-                        question="What are the biggest skill gaps you need to fill in the next 12 months?",
-                        follow_up_triggers=["no_awareness", "critical_gaps"],
-                        importance=3
-                    )
-                ]
-            },
-            
-            InterviewSection.BUSINESS_MODEL: {
-                "duration": 900,  # 15 minutes
-                "objectives": ["understand_monetization", "assess_scalability", "evaluate_metrics"],
-                "questions": [
-                    InterviewQuestion(
-                        section=InterviewSection.BUSINESS_MODEL,
-                        question="How do you make money? Walk me through your revenue model and pricing strategy.",
-                        follow_up_triggers=["unclear_model", "no_revenue", "unsustainable_pricing"],
-                        importance=5
-                    ),
-                    InterviewQuestion(
-                        section=InterviewSection.BUSINESS_MODEL,
-                        question="What's your path to profitability? When do you expect to break even?",
-                        follow_up_triggers=["no_path", "unrealistic_timeline"],
-                        importance=4
-                    ),
-                    InterviewQuestion(
-                        section=InterviewSection.BUSINESS_MODEL,
-                        question="What are your key metrics and how are you currently performing against them?",
-                        follow_up_triggers=["wrong_metrics", "poor_performance", "no_tracking"],
-                        importance=4
-                    )
-                ]
-            },
-            
-            InterviewSection.WRAP_UP: {
-                "duration": 300,  # 5 minutes
-                "objectives": ["summarize_key_points", "clarify_next_steps", "thank_participant"],
-                "questions": [
-                    InterviewQuestion(
-                        section=InterviewSection.WRAP_UP,
-                        question="Is there anything important about your startup that we haven't covered today?",
-                        follow_up_triggers=["new_information"],
-                        importance=3
-                    ),
-                    InterviewQuestion(
-                        section=InterviewSection.WRAP_UP,
-                        question="What questions do you have about our investment process or evaluation criteria?",
-                        follow_up_triggers=["process_questions"],
-                        importance=2
-                    )
-                ]
-            }
-        }
-    
     async def conduct_interview(self, startup_id: str, founder_email: str, founder_name: str) -> InterviewSession:
         """Conduct a complete interview session"""
         
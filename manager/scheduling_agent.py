@@ -15,8 +15,6 @@ import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from google.cloud import firestore
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
 from vertexai.generative_models import GenerativeModel
 import vertexai
 
@@ -15,8 +15,7 @@ def run_bigquery_query(sql_query: str, config: Dict[str, str]) -> str:
             rows.append({field.name: row[field.name] for field in results.schema})
 
         result_str = "Query Results:\n"
-        for idx, row in enumerate(rows, start=1):
-            result_str += f"{idx}. {row}\n"
+        result_str += "".join(f"{idx}. {row}\n" for idx, row in enumerate(rows, start=1))
 
         result_str += f"\n[Executed at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}]"
         return result_str
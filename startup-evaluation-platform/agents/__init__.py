@@ -0,0 +1,4 @@
+"""
+Startup Evaluation Agents
+Run an agent from the project root with: python -m agents.<module> [--project-id PROJECT]
+"""
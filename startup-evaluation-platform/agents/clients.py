@@ -0,0 +1,41 @@
+"""
+Shared Clients - Python Implementation
+Process-wide Google Cloud clients reused by every agent and the API
+"""
+
+import functools
+import os
+from typing import Optional, Tuple
+
+import google.auth
+from google.auth.credentials import Credentials
+from google.cloud import firestore
+from vertexai.generative_models import GenerativeModel
+import vertexai
+
+@functools.lru_cache(maxsize=None)
+def get_default_credentials() -> Tuple[Credentials, Optional[str]]:
+    """Application default credentials and project, resolved once per process
+    
+    google.auth.default() probes several credential sources and can shell out to gcloud
+    for the project ID, so every client built here reuses the first result.
+    """
+    credentials, project_id = google.auth.default()
+    return credentials, os.getenv("GOOGLE_CLOUD_PROJECT") or project_id
+
+@functools.lru_cache(maxsize=None)
+def get_firestore_client() -> firestore.Client:
+    """Firestore client shared process-wide so its gRPC channel and credentials are reused"""
+    credentials, project_id = get_default_credentials()
+    return firestore.Client(project=project_id, credentials=credentials)
+
+@functools.lru_cache(maxsize=None)
+def init_vertex_ai(project_id: str, location: str):
+    """Initialize Vertex AI once per project/location with the shared credentials"""
+    credentials, _ = get_default_credentials()
+    vertexai.init(project=project_id, location=location, credentials=credentials)
+
+@functools.lru_cache(maxsize=None)
+def get_generative_model(model_name: str) -> GenerativeModel:
+    """Generative model shared by every agent using the same model; call init_vertex_ai first"""
+    return GenerativeModel(model_name)
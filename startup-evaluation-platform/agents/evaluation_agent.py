@@ -3,24 +3,46 @@ Startup Evaluation Agent - Python Implementation
 AI agent for comprehensive startup evaluation using Vertex AI
 """
 
+import argparse
 import asyncio
+import hashlib
 import json
 import logging
+import os
+import re
+import sys
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional
 from dataclasses import dataclass
 from enum import Enum
 
-import requests
-from google.cloud import firestore
-from google.cloud import aiplatform
-from vertexai.generative_models import GenerativeModel, Part
-import vertexai
+# Running this file directly puts agents/ on sys.path instead of the project root
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.clients import get_firestore_client, get_generative_model, init_vertex_ai
+from agents.llm_cache import LLMResponseCache
+from agents.prompt_utils import to_prompt_json
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# A fully emitted "score" field in a (possibly partial) criterion response
+SCORE_PATTERN = re.compile(r'"score"\s*:\s*(-?\d+(?:\.\d+)?)\s*[,}\n]')
+
+# Model calls per JSON prompt before falling back to defaults (first try plus re-prompts)
+JSON_MAX_ATTEMPTS = 3
+
+# Asks Gemini for a bare JSON body instead of prose or a Markdown-fenced block
+JSON_GENERATION_CONFIG = {"response_mime_type": "application/json"}
+
+# A response wrapped in a Markdown code fence, e.g. ```json ... ```
+CODE_FENCE_PATTERN = re.compile(r"^\s*```[\w-]*\s*\n?(.*?)\n?\s*```\s*$", re.DOTALL)
+
+# Maximum number of web research queries in flight at once
+RESEARCH_CONCURRENCY = int(os.getenv("RESEARCH_CONCURRENCY", "4"))
+
 class EvaluationCriteria(Enum):
     FOUNDER_MARKET_FIT = "founder_market_fit"
     PROBLEM_EVALUATION = "problem_evaluation"
@@ -36,6 +58,7 @@ class EvaluationResult:
     risk_factors: List[str]
     confidence_score: float
     timestamp: datetime
+    reused: bool = False  # True when loaded from an earlier evaluation of identical input
 
 class StartupEvaluationAgent:
     """Main evaluation agent for startup analysis"""
@@ -45,11 +68,14 @@ class StartupEvaluationAgent:
         self.location = location
         
         # Initialize Vertex AI
-        vertexai.init(project=project_id, location=location)
-        self.model = GenerativeModel("gemini-1.5-pro")
+        init_vertex_ai(project_id, location)
+        self.model_name = "gemini-1.5-pro"
+        self.model = get_generative_model(self.model_name)
+        self.response_cache = LLMResponseCache()
+        self.json_retry_count = 0  # Re-prompts issued after unparseable JSON responses
         
         # Initialize Firestore
-        self.db = firestore.Client()
+        self.db = get_firestore_client()
         
         # Evaluation weights
         self.criteria_weights = {
@@ -59,9 +85,112 @@ class StartupEvaluationAgent:
             EvaluationCriteria.TEAM_PROFILE: 0.25
         }
     
-    async def evaluate_startup(self, startup_data: Dict[str, Any]) -> EvaluationResult:
+    async def _generate_text(self, prompt: str, generation_config: Optional[Dict[str, Any]] = None,
+                             validate: Optional[Callable[[str], Any]] = None) -> str:
+        """Run the model on a prompt, reusing a cached response when caching is enabled
+        
+        validate raises ValueError for unusable output; such responses are never cached or replayed.
+        """
+        
+        # The generation config changes the output format, so it is part of the cache key
+        model_key = self.model_name
+        if generation_config:
+            model_key = f"{self.model_name}:{json.dumps(generation_config, sort_keys=True)}"
+        
+        cache_key = self.response_cache.make_key(type(self).__name__, model_key, prompt)
+        cached_text = self.response_cache.get(cache_key)
+        
+        if cached_text is not None:
+            try:
+                if validate is not None:
+                    validate(cached_text)
+                return cached_text
+            except ValueError:
+                logger.warning("Ignoring cached response that fails validation: %s", cache_key)
+        
+        response = await self.model.generate_content_async(prompt, generation_config=generation_config)
+        if validate is not None:
+            validate(response.text)
+        self.response_cache.put(cache_key, response.text, type(self).__name__, model_key)
+        return response.text
+    
+    @staticmethod
+    def _parse_json_response(response_text: str, expected_type: type) -> Any:
+        """Parse a model JSON response, raising ValueError when it is unusable"""
+        
+        # Fenced output is well-formed JSON in a wrapper; unwrap it rather than spending a re-prompt
+        fence_match = CODE_FENCE_PATTERN.match(response_text)
+        if fence_match:
+            response_text = fence_match.group(1)
+        
+        result = json.loads(response_text)
+        if not isinstance(result, expected_type):
+            raise ValueError(f"expected a JSON {expected_type.__name__}, got {type(result).__name__}")
+        return result
+    
+    async def _generate_json(self, prompt: str, expected_type: type) -> Any:
+        """Generate a JSON response, re-prompting with the parse error when the output is unusable"""
+        
+        parse = lambda text: self._parse_json_response(text, expected_type)
+        
+        attempt_prompt = prompt
+        for attempt in range(1, JSON_MAX_ATTEMPTS + 1):
+            try:
+                # Validated before caching, so an unparseable response is not replayed on later runs
+                response_text = await self._generate_text(attempt_prompt, JSON_GENERATION_CONFIG, validate=parse)
+                return parse(response_text)
+            except ValueError as e:
+                if attempt == JSON_MAX_ATTEMPTS:
+                    raise
+                
+                self.json_retry_count += 1
+                logger.warning("Invalid JSON response (attempt %d/%d): %s", attempt, JSON_MAX_ATTEMPTS, e)
+                attempt_prompt = f"{prompt}\nYour previous output could not be parsed ({e}). Return only the requested JSON.\n"
+    
+    async def _generate_score(self, prompt: str, default: float = 50.0) -> float:
+        """Stream a criterion prompt and stop generating once the score has been emitted"""
+        
+        cache_key = self.response_cache.make_key(type(self).__name__, self.model_name, prompt)
+        response_text = self.response_cache.get(cache_key)
+        
+        if response_text is None:
+            response_text = ""
+            try:
+                stream = await self.model.generate_content_async(prompt, stream=True)
+                try:
+                    async for chunk in stream:
+                        response_text += chunk.text
+                        # Only the score is used; the reasoning that follows it is not worth waiting for
+                        if SCORE_PATTERN.search(response_text):
+                            break
+                finally:
+                    # Breaking out early leaves the stream open; closing it cancels the rest of the generation
+                    aclose = getattr(stream, "aclose", None)
+                    if aclose is not None:
+                        await aclose()
+            except Exception as e:
+                # Blocked or empty chunks raise on .text; fall back like an unparseable response
+                logger.warning("Score generation failed, using default score: %s", e)
+                return default
+            
+            self.response_cache.put(cache_key, response_text, type(self).__name__, self.model_name)
+        
+        match = SCORE_PATTERN.search(response_text)
+        return float(match.group(1)) if match else default  # Default score if parsing fails
+    
+    async def evaluate_startup(self, startup_data: Dict[str, Any], force_refresh: bool = False) -> EvaluationResult:
         """Main evaluation method"""
-        logger.info(f"Starting evaluation for startup: {startup_data.get('name')}")
+        
+        startup_id = startup_data.get('startup_id')
+        input_hash = self._input_hash(startup_data)
+        if startup_id and not force_refresh:
+            # Fast path: reuse a completed evaluation of identical input instead of re-running every model call
+            cached_result = await self._load_completed_evaluation(startup_id, input_hash)
+            if cached_result is not None:
+                logger.info("Reusing completed evaluation for startup: %s", startup_id)
+                return cached_result
+        
+        logger.info("Starting evaluation for startup: %s", startup_data.get('name'))
         
         try:
             # Step 1: Extract and structure data
@@ -70,11 +199,17 @@ class StartupEvaluationAgent:
             # Step 2: Conduct web research
             research_data = await self._conduct_web_research(structured_data)
             
-            # Step 3: Analyze each criterion
-            founder_score = await self._evaluate_founder_market_fit(structured_data, research_data)
-            problem_score = await self._evaluate_problem_and_competition(structured_data, research_data)
-            usp_score = await self._evaluate_usp(structured_data, research_data)
-            team_score = await self._evaluate_team_profile(structured_data, research_data)
+            # Serialize the shared prompt inputs once; every criterion prompt embeds them
+            structured_json = to_prompt_json(structured_data)
+            research_json = to_prompt_json(research_data)
+            
+            # Step 3: Analyze each criterion (independent model calls, run concurrently)
+            founder_score, problem_score, usp_score, team_score = await asyncio.gather(
+                self._evaluate_founder_market_fit(structured_json, research_json),
+                self._evaluate_problem_and_competition(structured_json, research_json),
+                self._evaluate_usp(structured_json, research_json),
+                self._evaluate_team_profile(structured_json, research_json)
+            )
             
             # Step 4: Calculate overall score
             scores = {
@@ -90,15 +225,16 @@ class StartupEvaluationAgent:
             )
             scores["overall_score"] = overall_score
             
-            # Step 5: Generate recommendations and risk factors
-            recommendations = await self._generate_recommendations(scores, structured_data, research_data)
-            risk_factors = await self._identify_risk_factors(scores, structured_data, research_data)
-            
-            # Step 6: Calculate confidence score
-            confidence_score = await self._calculate_confidence_score(structured_data, research_data)
+            # Step 5: Generate recommendations, risk factors and confidence score concurrently
+            scores_json = to_prompt_json(scores)
+            recommendations, risk_factors, confidence_score = await asyncio.gather(
+                self._generate_recommendations(scores_json),
+                self._identify_risk_factors(scores_json),
+                self._calculate_confidence_score(structured_data, research_data)
+            )
             
             result = EvaluationResult(
-                startup_id=startup_data.get('startup_id'),
+                startup_id=startup_id,
                 scores=scores,
                 analysis={
                     'structured_data': structured_data,
@@ -111,22 +247,52 @@ class StartupEvaluationAgent:
             )
             
             # Save results to Firestore
-            await self._save_evaluation_result(result)
+            await self._save_evaluation_result(result, input_hash)
             
-            logger.info(f"Evaluation completed. Overall score: {overall_score:.2f}")
+            logger.info("Evaluation completed. Overall score: %.2f", overall_score)
             return result
             
         except Exception as e:
-            logger.error(f"Evaluation failed: {str(e)}")
+            logger.error("Evaluation failed: %s", e)
             raise
     
+    @staticmethod
+    def _input_hash(startup_data: Dict[str, Any]) -> str:
+        """Fingerprint of the submitted data; key order and whitespace do not affect it"""
+        normalized = json.dumps(startup_data, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+    
+    async def _load_completed_evaluation(self, startup_id: str, input_hash: str) -> Optional[EvaluationResult]:
+        """Load a previously completed evaluation from Firestore if it was computed from the same input"""
+        
+        doc = await asyncio.to_thread(self.db.collection('evaluations').document(startup_id).get)
+        if not doc.exists:
+            return None
+        
+        data = doc.to_dict()
+        if data.get('status') != 'completed' or not data.get('scores'):
+            return None
+        
+        # Resubmitted materials must be re-evaluated; results saved without a hash never match
+        if data.get('input_hash') != input_hash:
+            return None
+        
+        return EvaluationResult(
+            startup_id=startup_id,
+            scores=data['scores'],
+            analysis={},  # Intermediate analysis is not persisted with the result
+            recommendations=data.get('recommendations', []),
+            risk_factors=data.get('risk_factors', []),
+            confidence_score=data.get('confidence_score', 0.0),
+            timestamp=data.get('completed_at', datetime.utcnow()),
+            reused=True
+        )
+    
     async def _extract_key_data(self, startup_data: Dict[str, Any]) -> Dict[str, Any]:
         """Extract and structure key information from startup data"""
         
         prompt = f"""
-        Analyze the following startup information and extract key structured data:
-        
-        Startup Data: {json.dumps(startup_data, indent=2)}
+        Analyze the startup information below and extract key structured data.
         
         Please extract and structure the following information:
         1. Company basics (name, industry, stage, location)
@@ -139,15 +305,13 @@ class StartupEvaluationAgent:
         8. Traction and key metrics
         
         Return the response as a structured JSON object.
-        """
         
-        response = await self.model.generate_content_async(prompt)
+        Startup Data: {to_prompt_json(startup_data)}
+        """
         
         try:
-            # Parse the JSON response
-            structured_data = json.loads(response.text)
-            return structured_data
-        except json.JSONDecodeError:
+            return await self._generate_json(prompt, dict)
+        except ValueError:
             # Fallback: create basic structure
             return {
                 "company_basics": startup_data.get('startup_info', {}),
@@ -158,8 +322,9 @@ class StartupEvaluationAgent:
     async def _conduct_web_research(self, structured_data: Dict[str, Any]) -> Dict[str, Any]:
         """Conduct comprehensive web research"""
         
-        company_name = structured_data.get('company_basics', {}).get('name', '')
-        industry = structured_data.get('company_basics', {}).get('industry', '')
+        company_basics = structured_data.get('company_basics', {})
+        company_name = company_basics.get('name', '')
+        industry = company_basics.get('industry', '')
         
         research_queries = [
             f"{company_name} startup funding news",
@@ -168,16 +333,20 @@ class StartupEvaluationAgent:
             f"{company_name} founder background linkedin"
         ]
         
-        research_results = {}
+        semaphore = asyncio.Semaphore(RESEARCH_CONCURRENCY)
         
-        for query in research_queries:
-            try:
-                # Simulate web search (replace with actual search API)
-                search_results = await self._search_web(query)
-                research_results[query] = search_results
-            except Exception as e:
-                logger.warning(f"Search failed for query '{query}': {str(e)}")
-                research_results[query] = {"error": str(e)}
+        async def run_query(query: str) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    # Simulate web search (replace with actual search API)
+                    return await self._search_web(query)
+                except Exception as e:
+                    logger.warning("Search failed for query '%s': %s", query, e)
+                    return {"error": str(e)}
+        
+        # Queries are independent, so run them concurrently up to the configured limit
+        search_results = await asyncio.gather(*(run_query(query) for query in research_queries))
+        research_results = dict(zip(research_queries, search_results))
         
         return {
             "queries": research_queries,
@@ -195,15 +364,12 @@ class StartupEvaluationAgent:
             ]
         }
     
-    async def _evaluate_founder_market_fit(self, structured_data: Dict[str, Any], research_data: Dict[str, Any]) -> float:
+    async def _evaluate_founder_market_fit(self, structured_json: str, research_json: str) -> float:
         """Evaluate founder-market fit (0-100 score)"""
         
         prompt = f"""
         Evaluate the founder-market fit for this startup based on the following criteria:
         
-        Structured Data: {json.dumps(structured_data, indent=2)}
-        Research Data: {json.dumps(research_data, indent=2)}
-        
         Evaluation Criteria:
         1. Domain Expertise (40%): Founder's knowledge and experience in the target market
         2. Previous Experience (30%): Relevant startup, industry, or leadership experience
@@ -211,25 +377,19 @@ class StartupEvaluationAgent:
         
         Provide a score from 0-100 and detailed reasoning for each criterion.
         Return as JSON: {{"score": 75, "reasoning": {{"domain_expertise": "...", "previous_experience": "...", "network_strength": "..."}}}}
-        """
         
-        response = await self.model.generate_content_async(prompt)
+        Structured Data: {structured_json}
+        Research Data: {research_json}
+        """
         
-        try:
-            result = json.loads(response.text)
-            return float(result.get('score', 50))
-        except:
-            return 50.0  # Default score if parsing fails
+        return await self._generate_score(prompt)
     
-    async def _evaluate_problem_and_competition(self, structured_data: Dict[str, Any], research_data: Dict[str, Any]) -> float:
+    async def _evaluate_problem_and_competition(self, structured_json: str, research_json: str) -> float:
         """Evaluate problem validation and competitive landscape"""
         
         prompt = f"""
         Evaluate the problem and competition for this startup:
         
-        Data: {json.dumps(structured_data, indent=2)}
-        Research: {json.dumps(research_data, indent=2)}
-        
         Criteria:
         1. Market Size (40%): Total addressable market and growth potential
         2. Problem Urgency (30%): How critical is the problem being solved
@@ -237,71 +397,56 @@ class StartupEvaluationAgent:
         
         Score 0-100 with reasoning.
         Return JSON: {{"score": 80, "reasoning": {{"market_size": "...", "problem_urgency": "...", "competition": "..."}}}}
-        """
         
-        response = await self.model.generate_content_async(prompt)
+        Data: {structured_json}
+        Research: {research_json}
+        """
         
-        try:
-            result = json.loads(response.text)
-            return float(result.get('score', 50))
-        except:
-            return 50.0
+        return await self._generate_score(prompt)
     
-    async def _evaluate_usp(self, structured_data: Dict[str, Any], research_data: Dict[str, Any]) -> float:
+    async def _evaluate_usp(self, structured_json: str, research_json: str) -> float:
         """Evaluate unique selling proposition"""
         
         prompt = f"""
         Evaluate the USP and competitive advantage:
         
-        Data: {json.dumps(structured_data, indent=2)}
-        
         Criteria:
         1. Uniqueness (40%): How unique is the solution
         2. Defensibility (30%): Barriers to entry and IP protection
         3. Scalability (30%): Ability to scale the solution
         
         Score 0-100 with reasoning.
-        """
+        Return JSON: {{"score": 70, "reasoning": {{"uniqueness": "...", "defensibility": "...", "scalability": "..."}}}}
         
-        response = await self.model.generate_content_async(prompt)
+        Data: {structured_json}
+        """
         
-        try:
-            result = json.loads(response.text)
-            return float(result.get('score', 50))
-        except:
-            return 50.0
+        return await self._generate_score(prompt)
     
-    async def _evaluate_team_profile(self, structured_data: Dict[str, Any], research_data: Dict[str, Any]) -> float:
+    async def _evaluate_team_profile(self, structured_json: str, research_json: str) -> float:
         """Evaluate overall team profile"""
         
         prompt = f"""
         Evaluate the team composition and capabilities:
         
-        Data: {json.dumps(structured_data, indent=2)}
-        
         Criteria:
         1. Technical Skills (40%): Technical expertise and capabilities
         2. Business Acumen (30%): Business and commercial skills
         3. Team Dynamics (30%): Team composition and working relationships
         
         Score 0-100 with reasoning.
-        """
+        Return JSON: {{"score": 70, "reasoning": {{"technical_skills": "...", "business_acumen": "...", "team_dynamics": "..."}}}}
         
-        response = await self.model.generate_content_async(prompt)
+        Data: {structured_json}
+        """
         
-        try:
-            result = json.loads(response.text)
-            return float(result.get('score', 50))
-        except:
-            return 50.0
+        return await self._generate_score(prompt)
     
-    async def _generate_recommendations(self, scores: Dict[str, float], structured_data: Dict[str, Any], research_data: Dict[str, Any]) -> List[str]:
+    async def _generate_recommendations(self, scores_json: str) -> List[str]:
         """Generate investment recommendations"""
         
         prompt = f"""
-        Based on the evaluation scores and analysis, generate 3-5 key recommendations:
-        
-        Scores: {json.dumps(scores, indent=2)}
+        Based on the evaluation scores and analysis, generate 3-5 key recommendations.
         
         Focus on:
         - Investment decision (invest/pass/more info needed)
@@ -310,23 +455,20 @@ class StartupEvaluationAgent:
         - Next steps for due diligence
         
         Return as JSON array: ["recommendation 1", "recommendation 2", ...]
-        """
         
-        response = await self.model.generate_content_async(prompt)
+        Scores: {scores_json}
+        """
         
         try:
-            recommendations = json.loads(response.text)
-            return recommendations if isinstance(recommendations, list) else []
-        except:
+            return await self._generate_json(prompt, list)
+        except ValueError:
             return ["Further analysis required", "Schedule founder interview"]
     
-    async def _identify_risk_factors(self, scores: Dict[str, float], structured_data: Dict[str, Any], research_data: Dict[str, Any]) -> List[str]:
+    async def _identify_risk_factors(self, scores_json: str) -> List[str]:
         """Identify key risk factors"""
         
         prompt = f"""
-        Identify 3-5 key risk factors based on the evaluation:
-        
-        Scores: {json.dumps(scores, indent=2)}
+        Identify 3-5 key risk factors based on the evaluation.
         
         Consider:
         - Market risks
@@ -336,14 +478,13 @@ class StartupEvaluationAgent:
         - Financial risks
         
         Return as JSON array: ["risk 1", "risk 2", ...]
-        """
         
-        response = await self.model.generate_content_async(prompt)
+        Scores: {scores_json}
+        """
         
         try:
-            risks = json.loads(response.text)
-            return risks if isinstance(risks, list) else []
-        except:
+            return await self._generate_json(prompt, list)
+        except ValueError:
             return ["Market competition", "Execution risk"]
     
     async def _calculate_confidence_score(self, structured_data: Dict[str, Any], research_data: Dict[str, Any]) -> float:
@@ -356,8 +497,8 @@ class StartupEvaluationAgent:
         confidence = min(100, (data_completeness + research_quality) * 50)
         return confidence
     
-    async def _save_evaluation_result(self, result: EvaluationResult):
-        """Save evaluation result to Firestore"""
+    async def _save_evaluation_result(self, result: EvaluationResult, input_hash: str):
+        """Save evaluation result to Firestore along with the hash of the input it was computed from"""
         
         doc_ref = self.db.collection('evaluations').document(result.startup_id)
         
@@ -367,19 +508,20 @@ class StartupEvaluationAgent:
             'recommendations': result.recommendations,
             'risk_factors': result.risk_factors,
             'confidence_score': result.confidence_score,
+            'input_hash': input_hash,
             'status': 'completed',
             'completed_at': result.timestamp,
             'updated_at': result.timestamp
         }
         
-        doc_ref.set(evaluation_data, merge=True)
-        logger.info(f"Evaluation result saved for startup: {result.startup_id}")
+        await asyncio.to_thread(doc_ref.set, evaluation_data, merge=True)
+        logger.info("Evaluation result saved for startup: %s", result.startup_id)
 
 # Usage example
-async def main():
+async def main(project_id: str):
     """Example usage of the evaluation agent"""
     
-    agent = StartupEvaluationAgent(project_id="your-project-id")
+    agent = StartupEvaluationAgent(project_id=project_id)
     
     sample_startup_data = {
         "startup_id": "test-startup-123",
@@ -403,4 +545,9 @@ async def main():
     print(f"Evaluation completed with overall score: {result.scores['overall_score']:.2f}")
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Evaluate a sample startup with the evaluation agent")
+    parser.add_argument("--project-id", default=os.getenv("GOOGLE_CLOUD_PROJECT", "your-project-id"),
+                        help="Google Cloud project (defaults to $GOOGLE_CLOUD_PROJECT)")
+    args = parser.parse_args()
+    
+    asyncio.run(main(args.project_id))
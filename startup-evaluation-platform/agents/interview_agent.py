@@ -3,10 +3,15 @@ Interview Agent - Python Implementation
 AI agent for conducting voice interviews with startup founders
 """
 
+import argparse
 import asyncio
+import functools
 import json
 import logging
-from datetime import datetime, timedelta
+import os
+import random
+import sys
+from datetime import datetime
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
@@ -16,8 +21,14 @@ from google.cloud import firestore
 from google.cloud import speech
 from google.cloud import texttospeech
 from google.cloud import storage
-from vertexai.generative_models import GenerativeModel
-import vertexai
+
+# Running this file directly puts agents/ on sys.path instead of the project root
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.clients import get_default_credentials, get_firestore_client, get_generative_model, init_vertex_ai
+from agents.llm_cache import LLMResponseCache
+from agents.prompt_utils import to_prompt_json
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -37,14 +48,14 @@ class InterviewSection(Enum):
     BUSINESS_MODEL = "business_model"
     WRAP_UP = "wrap_up"
 
-@dataclass
+@dataclass(slots=True)
 class InterviewQuestion:
     section: InterviewSection
     question: str
     follow_up_triggers: List[str]
     importance: int  # 1-5 scale
 
-@dataclass
+@dataclass(slots=True)
 class InterviewResponse:
     question: str
     response: str
@@ -53,7 +64,7 @@ class InterviewResponse:
     confidence_score: float
     red_flags: List[str]
 
-@dataclass
+@dataclass(slots=True)
 class InterviewSession:
     session_id: str
     startup_id: str
@@ -67,6 +78,180 @@ class InterviewSession:
     key_insights: List[str]
     red_flags: List[str]
 
+# Structured interview framework shared by all interview agent instances
+INTERVIEW_STRUCTURE: Dict[InterviewSection, Dict[str, Any]] = {
+    InterviewSection.INTRODUCTION: {
+        "duration": 300,  # 5 minutes
+        "objectives": ["establish_rapport", "explain_process", "get_consent"],
+        "questions": [
+            InterviewQuestion(
+                section=InterviewSection.INTRODUCTION,
+                question="Thank you for joining us today. Before we begin, may I have your consent to record this conversation for evaluation purposes?",
+                follow_up_triggers=["consent", "recording"],
+                importance=5
+            ),
+            InterviewQuestion(
+                section=InterviewSection.INTRODUCTION,
+                question="Could you briefly introduce yourself and your role at the company?",
+                follow_up_triggers=["background", "role"],
+                importance=4
+            )
+        ]
+    },
+    
+    InterviewSection.FOUNDER_BACKGROUND: {
+        "duration": 900,  # 15 minutes
+        "objectives": ["assess_experience", "understand_motivation", "evaluate_domain_expertise"],
+        "questions": [
+            InterviewQuestion(
+                section=InterviewSection.FOUNDER_BACKGROUND,
+                question="Tell me about your journey that led to starting this company. What specific experiences prepared you for this venture?",
+                follow_up_triggers=["vague", "generic", "missing_details"],
+                importance=5
+            ),
+            InterviewQuestion(
+                section=InterviewSection.FOUNDER_BACKGROUND,
+                question="What specific experience do you have in this market or industry?",
+                follow_up_triggers=["no_experience", "limited_experience"],
+                importance=5
+            ),
+            InterviewQuestion(
+                section=InterviewSection.FOUNDER_BACKGROUND,
+                question="How did you first identify this problem? Was it through personal experience or market research?",
+                follow_up_triggers=["personal_experience", "market_research", "timing"],
+                importance=4
+            )
+        ]
+    },
+    
+    InterviewSection.PROBLEM_DEEP_DIVE: {
+        "duration": 900,  # 15 minutes
+        "objectives": ["validate_problem", "understand_market", "assess_urgency"],
+        "questions": [
+            InterviewQuestion(
+                section=InterviewSection.PROBLEM_DEEP_DIVE,
+                question="Walk me through the exact problem you're solving. Can you give me a specific example of how this problem manifests for your customers?",
+                follow_up_triggers=["vague_problem", "no_examples", "theoretical"],
+                importance=5
+            ),
+            InterviewQuestion(
+                section=InterviewSection.PROBLEM_DEEP_DIVE,
+                question="How are customers currently handling this problem? What's the cost of not solving it?",
+                follow_up_triggers=["no_current_solution", "cost_unclear"],
+                importance=5
+            ),
+            InterviewQuestion(
+                section=InterviewSection.PROBLEM_DEEP_DIVE,
+                question="How big is this market? Have you validated the market size through research or customer interviews?",
+                follow_up_triggers=["no_validation", "unrealistic_size"],
+                importance=4
+            )
+        ]
+    },
+    
+    InterviewSection.SOLUTION_VALIDATION: {
+        "duration": 900,  # 15 minutes
+        "objectives": ["assess_solution_fit", "understand_validation", "evaluate_traction"],
+        "questions": [
+            InterviewQuestion(
+                section=InterviewSection.SOLUTION_VALIDATION,
+                question="How does your solution uniquely address this problem? What makes it different from existing alternatives?",
+                follow_up_triggers=["not_unique", "unclear_differentiation"],
+                importance=5
+            ),
+            InterviewQuestion(
+                section=InterviewSection.SOLUTION_VALIDATION,
+                question="What validation have you done with actual customers? Can you share specific feedback or metrics?",
+                follow_up_triggers=["no_validation", "vague_metrics", "no_customers"],
+                importance=5
+            ),
+            InterviewQuestion(
+                section=InterviewSection.SOLUTION_VALIDATION,
+                question="What's your current traction? How many customers do you have and what's your growth rate?",
+                follow_up_triggers=["no_traction", "declining_growth", "unrealistic_projections"],
+                importance=4
+            )
+        ]
+    },
+    
+    InterviewSection.TEAM_DYNAMICS: {
+        "duration": 600,  # 10 minutes
+        "objectives": ["assess_team_strength", "understand_dynamics", "identify_gaps"],
+        "questions": [
+            InterviewQuestion(
+                section=InterviewSection.TEAM_DYNAMICS,
+                question="Tell me about your co-founders and key team members. What unique skills does each person bring?",
+                follow_up_triggers=["weak_team", "missing_skills", "no_cofounders"],
+                importance=4
+            ),
+            InterviewQuestion(
+                section=InterviewSection.TEAM_DYNAMICS,
+                question="How do you handle disagreements or conflicts within the team? Can you give me an example?",
+                follow_up_triggers=["poor_communication", "unresolved_conflicts"],
+                importance=3
+            ),
+            InterviewQuestion(
+                section=InterviewSection.TEAM_DYNAMICS,
+                question="What are the biggest skill gaps you need to fill in the next 12 months?",
+                follow_up_triggers=["no_awareness", "critical_gaps"],
+                importance=3
+            )
+        ]
+    },
+    
+    InterviewSection.BUSINESS_MODEL: {
+        "duration": 900,  # 15 minutes
+        "objectives": ["understand_monetization", "assess_scalability", "evaluate_metrics"],
+        "questions": [
+            InterviewQuestion(
+                section=InterviewSection.BUSINESS_MODEL,
+                question="How do you make money? Walk me through your revenue model and pricing strategy.",
+                follow_up_triggers=["unclear_model", "no_revenue", "unsustainable_pricing"],
+                importance=5
+            ),
+            InterviewQuestion(
+                section=InterviewSection.BUSINESS_MODEL,
+                question="What's your path to profitability? When do you expect to break even?",
+                follow_up_triggers=["no_path", "unrealistic_timeline"],
+                importance=4
+            ),
+            InterviewQuestion(
+                section=InterviewSection.BUSINESS_MODEL,
+                question="What are your key metrics and how are you currently performing against them?",
+                follow_up_triggers=["wrong_metrics", "poor_performance", "no_tracking"],
+                importance=4
+            )
+        ]
+    },
+    
+    InterviewSection.WRAP_UP: {
+        "duration": 300,  # 5 minutes
+        "objectives": ["summarize_key_points", "clarify_next_steps", "thank_participant"],
+        "questions": [
+            InterviewQuestion(
+                section=InterviewSection.WRAP_UP,
+                question="Is there anything important about your startup that we haven't covered today?",
+                follow_up_triggers=["new_information"],
+                importance=3
+            ),
+            InterviewQuestion(
+                section=InterviewSection.WRAP_UP,
+                question="What questions do you have about our investment process or evaluation criteria?",
+                follow_up_triggers=["process_questions"],
+                importance=2
+            )
+        ]
+    }
+}
+
+# Canned founder answers returned by the placeholder listener until speech capture is wired up
+SAMPLE_FOUNDER_RESPONSES = (
+    "Well, I started this company because I experienced this problem firsthand when I was working at my previous job. We were constantly struggling with inefficient processes.",
+    "Our solution is unique because we use AI to automate what was previously a manual process. This saves our customers about 40% of their time.",
+    "We've validated this with 50 potential customers through interviews, and 80% said they would pay for this solution.",
+    "Our team has complementary skills - I handle the business side while my co-founder is the technical lead with 15 years of experience."
+)
+
 class StartupInterviewAgent:
     """AI agent for conducting structured interviews with startup founders"""
     
@@ -75,17 +260,16 @@ class StartupInterviewAgent:
         self.location = location
         
         # Initialize Vertex AI
-        vertexai.init(project=project_id, location=location)
-        self.model = GenerativeModel("gemini-1.5-pro")
+        init_vertex_ai(project_id, location)
+        self.model_name = "gemini-1.5-pro"
+        self.model = get_generative_model(self.model_name)
+        self.response_cache = LLMResponseCache()
         
-        # Initialize Google Cloud services
-        self.db = firestore.Client()
-        self.speech_client = speech.SpeechClient()
-        self.tts_client = texttospeech.TextToSpeechClient()
-        self.storage_client = storage.Client()
+        # Initialize Google Cloud services; speech, TTS and storage clients are created on first use
+        self.db = get_firestore_client()
         
         # Interview configuration
-        self.interview_structure = self._initialize_interview_structure()
+        self.interview_structure = INTERVIEW_STRUCTURE
         self.current_section = InterviewSection.INTRODUCTION
         self.section_start_time = None
         
@@ -102,179 +286,42 @@ class StartupInterviewAgent:
             pitch=0.0
         )
     
-    def _initialize_interview_structure(self) -> Dict[InterviewSection, Dict[str, Any]]:
-        """Initialize the structured interview framework"""
+    @functools.cached_property
+    def speech_client(self) -> speech.SpeechClient:
+        """Speech-to-Text client, created on first use"""
+        credentials, _ = get_default_credentials()
+        return speech.SpeechClient(credentials=credentials)
+    
+    @functools.cached_property
+    def tts_client(self) -> texttospeech.TextToSpeechClient:
+        """Text-to-Speech client, created on first use"""
+        credentials, _ = get_default_credentials()
+        return texttospeech.TextToSpeechClient(credentials=credentials)
+    
+    @functools.cached_property
+    def storage_client(self) -> storage.Client:
+        """Cloud Storage client, created on first use"""
+        credentials, project_id = get_default_credentials()
+        return storage.Client(project=project_id, credentials=credentials)
+    
+    async def _generate_text(self, prompt: str) -> str:
+        """Run the model on a prompt, reusing a cached response when caching is enabled"""
         
-        return {
-            InterviewSection.INTRODUCTION: {
-                "duration": 300,  # 5 minutes
-                "objectives": ["establish_rapport", "explain_process", "get_consent"],
-                "questions": [
-                    InterviewQuestion(
-                        section=InterviewSection.INTRODUCTION,
-                        question="Thank you for joining us today. Before we begin, may I have your consent to record this conversation for evaluation purposes?",
-                        follow_up_triggers=["consent", "recording"],
-                        importance=5
-                    ),
-                    InterviewQuestion(
-                        section=InterviewSection.INTRODUCTION,
-                        question="Could you briefly introduce yourself and your role at the company?",
-                        follow_up_triggers=["background", "role"],
-                        importance=4
-                    )
-                ]
-            },
-            
-            InterviewSection.FOUNDER_BACKGROUND: {
-                "duration": 900,  # 15 minutes
-                "objectives": ["assess_experience", "understand_motivation", "evaluate_domain_expertise"],
-                "questions": [
-                    InterviewQuestion(
-                        section=InterviewSection.FOUNDER_BACKGROUND,
-                        question="Tell me about your journey that led to starting this company. What specific experiences prepared you for this venture?",
-                        follow_up_triggers=["vague", "generic", "missing_details"],
-                        importance=5
-                    ),
-                    InterviewQuestion(
-                        section=InterviewSection.FOUNDER_BACKGROUND,
-                        question="What specific experience do you have in this market or industry?",
-                        follow_up_triggers=["no_experience", "limited_experience"],
-                        importance=5
-                    ),
-                    InterviewQuestion(
-                        section=InterviewSection.FOUNDER_BACKGROUND,
-                        question="How did you first identify this problem? Was it through personal experience or market research?",
-                        follow_up_triggers=["personal_experience", "market_research", "timing"],
-                        importance=4
-                    )
-                ]
-            },
-            
-            InterviewSection.PROBLEM_DEEP_DIVE: {
-                "duration": 900,  # 15 minutes
-                "objectives": ["validate_problem", "understand_market", "assess_urgency"],
-                "questions": [
-                    InterviewQuestion(
-                        section=InterviewSection.PROBLEM_DEEP_DIVE,
-                        question="Walk me through the exact problem you're solving. Can you give me a specific example of how this problem manifests for your customers?",
-                        follow_up_triggers=["vague_problem", "no_examples", "theoretical"],
-                        importance=5
-                    ),
-                    InterviewQuestion(
-                        section=InterviewSection.PROBLEM_DEEP_DIVE,
-                        question="How are customers currently handling this problem? What's the cost of not solving it?",
-                        follow_up_triggers=["no_current_solution", "cost_unclear"],
-                        importance=5
-                    ),
-                    InterviewQuestion(
-                        section=InterviewSection.PROBLEM_DEEP_DIVE,
-                        question="How big is this market? Have you validated the market size through research or customer interviews?",
-                        follow_up_triggers=["no_validation", "unrealistic_size"],
-                        importance=4
-                    )
-                ]
-            },
-            
-            InterviewSection.SOLUTION_VALIDATION: {
-                "duration": 900,  # 15 minutes
-                "objectives": ["assess_solution_fit", "understand_validation", "evaluate_traction"],
-                "questions": [
-                    InterviewQuestion(
-                        section=InterviewSection.SOLUTION_VALIDATION,
-                        question="How does your solution uniquely address this problem? What makes it different from existing alternatives?",
-                        follow_up_triggers=["not_unique", "unclear_differentiation"],
-                        importance=5
-                    ),
-                    InterviewQuestion(
-                        section=InterviewSection.SOLUTION_VALIDATION,
-                        question="What validation have you done with actual customers? Can you share specific feedback or metrics?",
-                        follow_up_triggers=["no_validation", "vague_metrics", "no_customers"],
-                        importance=5
-                    ),
-                    InterviewQuestion(
-                        section=InterviewSection.SOLUTION_VALIDATION,
-                        question="What's your current traction? How many customers do you have and what's your growth rate?",
-                        follow_up_triggers=["no_traction", "declining_growth", "unrealistic_projections"],
-                        importance=4
-                    )
-                ]
-            },
-            
-            InterviewSection.TEAM_DYNAMICS: {
-                "duration": 600,  # 10 minutes
-                "objectives": ["assess_team_strength", "understand_dynamics", "identify_gaps"],
-                "questions": [
-                    InterviewQuestion(
-                        section=InterviewSection.TEAM_DYNAMICS,
-                        question="Tell me about your co-founders and key team members. What unique skills does each person bring?",
-                        follow_up_triggers=["weak_team", "missing_skills", "no_cofounders"],
-                        importance=4
-                    ),
-                    InterviewQuestion(
-                        section=InterviewSection.TEAM_DYNAMICS,
-                        question="How do you handle disagreements or conflicts within the team? Can you give me an example?",
-                        follow_up_triggers=["poor_communication", "unresolved_conflicts"],
-                        importance=3
-                    ),
-                    InterviewQuestion(
-                        section=InterviewSection.TEAM_DYNAMICS,
-                        question="What are the biggest skill gaps you need to fill in the next 12 months?",
-                        follow_up_triggers=["no_awareness", "critical_gaps"],
-                        importance=3
-                    )
-                ]
-            },
-            
-            InterviewSection.BUSINESS_MODEL: {
-                "duration": 900,  # 15 minutes
-                "objectives": ["understand_monetization", "assess_scalability", "evaluate_metrics"],
-                "questions": [
-                    InterviewQuestion(
-                        section=InterviewSection.BUSINESS_MODEL,
-                        question="How do you make money? Walk me through your revenue model and pricing strategy.",
-                        follow_up_triggers=["unclear_model", "no_revenue", "unsustainable_pricing"],
-                        importance=5
-                    ),
-                    InterviewQuestion(
-                        section=InterviewSection.BUSINESS_MODEL,
-                        question="What's your path to profitability? When do you expect to break even?",
-                        follow_up_triggers=["no_path", "unrealistic_timeline"],
-                        importance=4
-                    ),
-                    InterviewQuestion(
-                        section=InterviewSection.BUSINESS_MODEL,
-                        question="What are your key metrics and how are you currently performing against them?",
-                        follow_up_triggers=["wrong_metrics", "poor_performance", "no_tracking"],
-                        importance=4
-                    )
-                ]
-            },
-            
-            InterviewSection.WRAP_UP: {
-                "duration": 300,  # 5 minutes
-                "objectives": ["summarize_key_points", "clarify_next_steps", "thank_participant"],
-                "questions": [
-                    InterviewQuestion(
-                        section=InterviewSection.WRAP_UP,
-                        question="Is there anything important about your startup that we haven't covered today?",
-                        follow_up_triggers=["new_information"],
-                        importance=3
-                    ),
-                    InterviewQuestion(
-                        section=InterviewSection.WRAP_UP,
-                        question="What questions do you have about our investment process or evaluation criteria?",
-                        follow_up_triggers=["process_questions"],
-                        importance=2
-                    )
-                ]
-            }
-        }
+        cache_key = self.response_cache.make_key(type(self).__name__, self.model_name, prompt)
+        cached_text = self.response_cache.get(cache_key)
+        
+        if cached_text is not None:
+            return cached_text
+        
+        response = await self.model.generate_content_async(prompt)
+        self.response_cache.put(cache_key, response.text, type(self).__name__, self.model_name)
+        return response.text
     
     async def conduct_interview(self, startup_id: str, founder_email: str, founder_name: str) -> InterviewSession:
         """Conduct a complete interview session"""
         
         session_id = str(uuid.uuid4())
-        logger.info(f"Starting interview session {session_id} with {founder_name}")
+        logger.info("Starting interview session %s with %s", session_id, founder_name)
         
         session = InterviewSession(
             session_id=session_id,
@@ -290,21 +337,30 @@ class StartupInterviewAgent:
             red_flags=[]
         )
         
+        # Background write of the latest section progress, if one is in flight
+        pending_save: Optional[asyncio.Task] = None
+        
         try:
             # Save initial session
             await self._save_session(session)
             
             # Conduct each section of the interview
             for section in InterviewSection:
-                logger.info(f"Starting section: {section.value}")
+                logger.info("Starting section: %s", section.value)
                 self.current_section = section
                 self.section_start_time = datetime.utcnow()
                 
                 section_responses = await self._conduct_section(session, section)
                 session.responses.extend(section_responses)
                 
-                # Update session after each section
-                await self._save_session(session)
+                # Append the section's responses in the background while the next section runs;
+                # the previous write is awaited first so responses land in order
+                if pending_save is not None:
+                    await pending_save
+                pending_save = asyncio.create_task(self._append_responses(session, section_responses))
+            
+            await pending_save
+            pending_save = None
             
             # Finalize interview
             session.status = InterviewStatus.COMPLETED
@@ -315,17 +371,19 @@ class StartupInterviewAgent:
             session.key_insights = await self._extract_key_insights(session.responses)
             session.red_flags = await self._identify_red_flags(session.responses)
             
-            # Save final session
-            await self._save_session(session)
-            
-            # Generate interview report
-            await self._generate_interview_report(session)
+            # Save final session and its report in one batched commit; responses are already stored
+            batch = self.db.batch()
+            await self._save_session(session, batch, include_responses=False)
+            await self._generate_interview_report(session, batch)
+            await asyncio.to_thread(batch.commit)
             
-            logger.info(f"Interview completed successfully: {session_id}")
+            logger.info("Interview completed successfully: %s", session_id)
             return session
             
         except Exception as e:
-            logger.error(f"Interview failed: {str(e)}")
+            logger.error("Interview failed: %s", e)
+            if pending_save is not None:
+                await asyncio.gather(pending_save, return_exceptions=True)
             session.status = InterviewStatus.CANCELLED
             await self._save_session(session)
             raise
@@ -337,70 +395,90 @@ class StartupInterviewAgent:
         questions = section_config["questions"]
         responses = []
         
-        for question_obj in questions:
-            # Ask the question
-            response_text = await self._ask_question_and_get_response(question_obj.question)
-            
-            # Analyze the response
-            analysis = await self._analyze_response(question_obj.question, response_text)
-            
-            response = InterviewResponse(
-                question=question_obj.question,
-                response=response_text,
-                timestamp=datetime.utcnow(),
-                sentiment_score=analysis["sentiment_score"],
-                confidence_score=analysis["confidence_score"],
-                red_flags=analysis["red_flags"]
-            )
-            
-            responses.append(response)
-            
-            # Generate follow-up questions if needed
-            if analysis["needs_followup"]:
-                followup_questions = await self._generate_followup_questions(
-                    question_obj, response_text, analysis
-                )
+        # Speech for the next main question, synthesized while the current answer is analyzed
+        next_synthesis: Optional[asyncio.Task] = None
+        
+        try:
+            for index, question_obj in enumerate(questions):
+                # Ask the question, then analyze the response while the next question's audio is prepared
+                synthesis, next_synthesis = next_synthesis, None
+                response_text = await self._ask_question_and_get_response(question_obj.question, synthesis)
+                
+                if index + 1 < len(questions):
+                    next_synthesis = asyncio.create_task(self._synthesize_speech(questions[index + 1].question))
+                
+                response, analysis = await self._record_response(question_obj.question, response_text)
+                responses.append(response)
                 
-                for followup in followup_questions:
-                    followup_response = await self._ask_question_and_get_response(followup)
-                    followup_analysis = await self._analyze_response(followup, followup_response)
+                # Generate follow-up questions if needed
+                if analysis["needs_followup"]:
+                    followup_questions = await self._generate_followup_questions(
+                        question_obj, response.response, analysis
+                    )
                     
-                    responses.append(InterviewResponse(
-                        question=followup,
-                        response=followup_response,
-                        timestamp=datetime.utcnow(),
-                        sentiment_score=followup_analysis["sentiment_score"],
-                        confidence_score=followup_analysis["confidence_score"],
-                        red_flags=followup_analysis["red_flags"]
-                    ))
+                    for followup in followup_questions:
+                        followup_response, _ = await self._ask_and_analyze(followup)
+                        responses.append(followup_response)
+        finally:
+            # Await the cancelled prefetch so a synthesis error is retrieved instead of logged as never retrieved
+            if next_synthesis is not None:
+                next_synthesis.cancel()
+                await asyncio.gather(next_synthesis, return_exceptions=True)
         
         return responses
     
-    async def _ask_question_and_get_response(self, question: str) -> str:
+    async def _ask_and_analyze(self, question: str) -> Tuple[InterviewResponse, Dict[str, Any]]:
+        """Ask one question and record the analyzed response"""
+        
+        response_text = await self._ask_question_and_get_response(question)
+        return await self._record_response(question, response_text)
+    
+    async def _record_response(self, question: str, response_text: str) -> Tuple[InterviewResponse, Dict[str, Any]]:
+        """Analyze a founder's answer and wrap it as an interview response"""
+        
+        analysis = await self._analyze_response(question, response_text)
+        
+        response = InterviewResponse(
+            question=question,
+            response=response_text,
+            timestamp=datetime.utcnow(),
+            sentiment_score=analysis["sentiment_score"],
+            confidence_score=analysis["confidence_score"],
+            red_flags=analysis["red_flags"]
+        )
+        return response, analysis
+    
+    async def _ask_question_and_get_response(self, question: str, synthesis: Optional[asyncio.Task] = None) -> str:
         """Ask a question using text-to-speech and get response via speech-to-text"""
         
         # Convert question to speech
-        await self._speak_text(question)
+        await self._speak_text(question, synthesis)
         
         # Listen for response (placeholder - implement actual speech recognition)
         response = await self._listen_for_response()
         
         return response
     
-    async def _speak_text(self, text: str):
-        """Convert text to speech and play it"""
+    async def _synthesize_speech(self, text: str) -> texttospeech.SynthesizeSpeechResponse:
+        """Synthesize spoken audio for text"""
         
         synthesis_input = texttospeech.SynthesisInput(text=text)
         
-        response = self.tts_client.synthesize_speech(
+        return await asyncio.to_thread(
+            self.tts_client.synthesize_speech,
             input=synthesis_input,
             voice=self.voice_config,
             audio_config=self.audio_config
         )
+    
+    async def _speak_text(self, text: str, synthesis: Optional[asyncio.Task] = None):
+        """Convert text to speech and play it, reusing audio already being synthesized if given"""
+        
+        response = await synthesis if synthesis is not None else await self._synthesize_speech(text)
         
         # In a real implementation, you would play this audio
         # For now, we'll just log that the question was asked
-        logger.info(f"Asked question: {text[:50]}...")
+        logger.info("Asked question: %s...", text[:50])
     
     async def _listen_for_response(self) -> str:
         """Listen for and transcribe the founder's response"""
@@ -412,15 +490,7 @@ class StartupInterviewAgent:
         # 3. Return transcribed text
         
         # For demo purposes, return a sample response
-        sample_responses = [
-            "Well, I started this company because I experienced this problem firsthand when I was working at my previous job. We were constantly struggling with inefficient processes.",
-            "Our solution is unique because we use AI to automate what was previously a manual process. This saves our customers about 40% of their time.",
-            "We've validated this with 50 potential customers through interviews, and 80% said they would pay for this solution.",
-            "Our team has complementary skills - I handle the business side while my co-founder is the technical lead with 15 years of experience."
-        ]
-        
-        import random
-        return random.choice(sample_responses)
+        return random.choice(SAMPLE_FOUNDER_RESPONSES)
     
     async def _analyze_response(self, question: str, response: str) -> Dict[str, Any]:
         """Analyze the founder's response using AI"""
@@ -449,10 +519,10 @@ class StartupInterviewAgent:
         }}
         """
         
-        ai_response = await self.model.generate_content_async(prompt)
+        ai_response_text = await self._generate_text(prompt)
         
         try:
-            analysis = json.loads(ai_response.text)
+            analysis = json.loads(ai_response_text)
             return analysis
         except json.JSONDecodeError:
             # Return default analysis if parsing fails
@@ -473,7 +543,7 @@ class StartupInterviewAgent:
         
         Original Question: {original_question.question}
         Response: {response}
-        Analysis: {json.dumps(analysis, indent=2)}
+        Analysis: {to_prompt_json(analysis)}
         
         The follow-up questions should:
         1. Probe for specific examples if the response was vague
@@ -484,10 +554,10 @@ class StartupInterviewAgent:
         Return as JSON array: ["question1", "question2"]
         """
         
-        ai_response = await self.model.generate_content_async(prompt)
+        ai_response_text = await self._generate_text(prompt)
         
         try:
-            questions = json.loads(ai_response.text)
+            questions = json.loads(ai_response_text)
             return questions if isinstance(questions, list) else []
         except json.JSONDecodeError:
             return []
@@ -523,10 +593,10 @@ class StartupInterviewAgent:
         Return as JSON array: ["insight1", "insight2", ...]
         """
         
-        ai_response = await self.model.generate_content_async(prompt)
+        ai_response_text = await self._generate_text(prompt)
         
         try:
-            insights = json.loads(ai_response.text)
+            insights = json.loads(ai_response_text)
             return insights if isinstance(insights, list) else []
         except json.JSONDecodeError:
             return ["Interview completed successfully"]
@@ -541,8 +611,20 @@ class StartupInterviewAgent:
         # Remove duplicates and return unique red flags
         return list(set(all_red_flags))
     
-    async def _save_session(self, session: InterviewSession):
-        """Save interview session to database"""
+    @staticmethod
+    def _response_to_dict(response: InterviewResponse) -> Dict[str, Any]:
+        """Firestore representation of a single interview response"""
+        return {
+            'question': response.question,
+            'response': response.response,
+            'timestamp': response.timestamp,
+            'sentiment_score': response.sentiment_score,
+            'confidence_score': response.confidence_score,
+            'red_flags': response.red_flags
+        }
+    
+    async def _save_session(self, session: InterviewSession, batch: Optional[firestore.WriteBatch] = None, include_responses: bool = True):
+        """Save interview session to database, or queue it on a write batch"""
         
         session_data = {
             'session_id': session.session_id,
@@ -552,35 +634,47 @@ class StartupInterviewAgent:
             'status': session.status.value,
             'start_time': session.start_time,
             'end_time': session.end_time,
-            'responses': [
-                {
-                    'question': r.question,
-                    'response': r.response,
-                    'timestamp': r.timestamp,
-                    'sentiment_score': r.sentiment_score,
-                    'confidence_score': r.confidence_score,
-                    'red_flags': r.red_flags
-                } for r in session.responses
-            ],
             'overall_sentiment': session.overall_sentiment,
             'key_insights': session.key_insights,
             'red_flags': session.red_flags,
-            'updated_at': datetime.utcnow()
+            'updated_at': firestore.SERVER_TIMESTAMP
         }
         
-        self.db.collection('interview_sessions').document(session.session_id).set(session_data, merge=True)
-        logger.info(f"Session saved: {session.session_id}")
+        if include_responses:
+            session_data['responses'] = [self._response_to_dict(r) for r in session.responses]
+        
+        session_ref = self.db.collection('interview_sessions').document(session.session_id)
+        
+        if batch is not None:
+            batch.set(session_ref, session_data, merge=True)
+            return
+        
+        await asyncio.to_thread(session_ref.set, session_data, merge=True)
+        logger.info("Session saved: %s", session.session_id)
     
-    async def _generate_interview_report(self, session: InterviewSession):
-        """Generate comprehensive interview report"""
+    async def _append_responses(self, session: InterviewSession, responses: List[InterviewResponse]):
+        """Append new responses to the stored session without rewriting the earlier ones"""
+        
+        if not responses:
+            return
+        
+        session_ref = self.db.collection('interview_sessions').document(session.session_id)
+        await asyncio.to_thread(session_ref.update, {
+            'responses': firestore.ArrayUnion([self._response_to_dict(r) for r in responses]),
+            'updated_at': firestore.SERVER_TIMESTAMP
+        })
+        logger.info("Appended %d responses to session %s", len(responses), session.session_id)
+    
+    async def _generate_interview_report(self, session: InterviewSession, batch: firestore.WriteBatch):
+        """Generate comprehensive interview report and queue it on the write batch"""
         
         prompt = f"""
         Generate a comprehensive interview report based on this session:
         
         Founder: {session.founder_name}
         Overall Sentiment: {session.overall_sentiment}
-        Key Insights: {json.dumps(session.key_insights, indent=2)}
-        Red Flags: {json.dumps(session.red_flags, indent=2)}
+        Key Insights: {to_prompt_json(session.key_insights)}
+        Red Flags: {to_prompt_json(session.red_flags)}
         
         Include:
         1. Executive Summary
@@ -592,24 +686,24 @@ class StartupInterviewAgent:
         Format as a professional investment memo section.
         """
         
-        ai_response = await self.model.generate_content_async(prompt)
+        ai_response_text = await self._generate_text(prompt)
         
         # Save report to database
         report_data = {
             'session_id': session.session_id,
             'startup_id': session.startup_id,
-            'report_content': ai_response.text,
+            'report_content': ai_response_text,
             'generated_at': datetime.utcnow()
         }
         
-        self.db.collection('interview_reports').add(report_data)
-        logger.info(f"Interview report generated for session: {session.session_id}")
+        batch.set(self.db.collection('interview_reports').document(), report_data)
+        logger.info("Interview report generated for session: %s", session.session_id)
 
 # Usage example
-async def main():
+async def main(project_id: str):
     """Example usage of the interview agent"""
     
-    agent = StartupInterviewAgent(project_id="your-project-id")
+    agent = StartupInterviewAgent(project_id=project_id)
     
     session = await agent.conduct_interview(
         startup_id="startup-123",
@@ -621,4 +715,9 @@ async def main():
     print(f"Key insights: {session.key_insights}")
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Run a sample interview with the interview agent")
+    parser.add_argument("--project-id", default=os.getenv("GOOGLE_CLOUD_PROJECT", "your-project-id"),
+                        help="Google Cloud project (defaults to $GOOGLE_CLOUD_PROJECT)")
+    args = parser.parse_args()
+    
+    asyncio.run(main(args.project_id))
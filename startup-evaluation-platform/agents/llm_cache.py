@@ -0,0 +1,89 @@
+"""
+LLM Response Cache - Python Implementation
+Content-addressable on-disk cache for agent model calls
+"""
+
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Bump when the cached entry layout or key derivation changes
+CACHE_FORMAT_VERSION = 1
+
+class LLMResponseCache:
+    """Stores model responses keyed by a hash of (agent, model, prompt)
+    
+    Disabled unless a cache directory is given or AGENT_CACHE_DIR is set,
+    so production runs keep calling the model by default.
+    """
+    
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = cache_dir or os.getenv("AGENT_CACHE_DIR")
+        
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+    
+    @property
+    def enabled(self) -> bool:
+        return bool(self.cache_dir)
+    
+    @staticmethod
+    def make_key(agent_name: str, model_name: str, prompt: str) -> str:
+        """Derive the cache key; each part is length-prefixed so concatenations cannot collide"""
+        
+        digest = hashlib.sha256(CACHE_FORMAT_VERSION.to_bytes(8, "little"))
+        for part in (agent_name, model_name, prompt):
+            data = part.encode("utf-8")
+            digest.update(len(data).to_bytes(8, "little"))
+            digest.update(data)
+        
+        return digest.hexdigest()
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response text, or None on a miss"""
+        
+        if not self.enabled:
+            return None
+        
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning("Ignoring unreadable cache entry %s: %s", key, e)
+            return None
+        
+        return entry.get("text")
+    
+    def put(self, key: str, text: str, agent_name: str, model_name: str):
+        """Persist a response; written to a temp file first so readers never see partial entries"""
+        
+        if not self.enabled:
+            return
+        
+        entry = {
+            "text": text,
+            "agent": agent_name,
+            "model": model_name,
+            "format_version": CACHE_FORMAT_VERSION,
+            "cached_at": datetime.utcnow().isoformat()
+        }
+        
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("Failed to write cache entry %s: %s", key, e)
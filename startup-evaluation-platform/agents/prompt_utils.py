@@ -0,0 +1,40 @@
+"""
+Prompt Utilities - Python Implementation
+Helpers for embedding structured data into agent prompts
+"""
+
+import hashlib
+import os
+from typing import Any
+
+import orjson
+
+# Indented output is easier to read when debugging prompts, but costs input tokens
+_DUMPS_OPTIONS = orjson.OPT_NON_STR_KEYS
+if os.getenv("DEBUG", "").lower() in ("1", "true", "yes"):
+    _DUMPS_OPTIONS |= orjson.OPT_INDENT_2
+
+# Longest string field embedded verbatim; keeps prompt size bounded regardless of upstream verbosity
+PROMPT_FIELD_MAX_CHARS = int(os.getenv("PROMPT_FIELD_MAX_CHARS", "8000"))
+
+def truncate_for_prompt(data: Any, max_chars: int = PROMPT_FIELD_MAX_CHARS) -> Any:
+    """Return a copy of data with every string longer than max_chars cut short and marked"""
+    
+    if isinstance(data, str):
+        if len(data) <= max_chars:
+            return data
+        digest = hashlib.sha256(data.encode("utf-8")).hexdigest()[:12]
+        return f"{data[:max_chars]}...[truncated {len(data) - max_chars} chars; sha256={digest}]"
+    
+    if isinstance(data, dict):
+        return {key: truncate_for_prompt(value, max_chars) for key, value in data.items()}
+    
+    if isinstance(data, (list, tuple)):
+        return [truncate_for_prompt(item, max_chars) for item in data]
+    
+    return data
+
+def to_prompt_json(data: Any, max_field_chars: int = PROMPT_FIELD_MAX_CHARS) -> str:
+    """Serialize data compactly for a prompt, truncating oversized string fields"""
+    
+    return orjson.dumps(truncate_for_prompt(data, max_field_chars), default=str, option=_DUMPS_OPTIONS).decode()
@@ -3,26 +3,35 @@ Scheduling Agent - Python Implementation
 AI agent for coordinating meetings and communications with startup founders
 """
 
+import argparse
 import asyncio
 import json
 import logging
+import os
+import sys
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 from enum import Enum
 
-import smtplib
+import aiosmtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from google.cloud import firestore
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
-from vertexai.generative_models import GenerativeModel
-import vertexai
+
+# Running this file directly puts agents/ on sys.path instead of the project root
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.clients import get_firestore_client, get_generative_model, init_vertex_ai
+from agents.llm_cache import LLMResponseCache
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Outreach emails use the fixed template unless model-written personalization is explicitly enabled
+PERSONALIZE_OUTREACH_EMAILS = os.getenv("PERSONALIZE_OUTREACH_EMAILS", "").lower() in ("1", "true", "yes")
+
 class MeetingStatus(Enum):
     PENDING = "pending"
     SCHEDULED = "scheduled"
@@ -51,38 +60,11 @@ class ScheduledMeeting:
     status: MeetingStatus
     created_at: datetime
 
-class StartupSchedulingAgent:
-    """AI agent for scheduling and coordinating founder meetings"""
-    
-    def __init__(self, project_id: str, location: str = "us-central1"):
-        self.project_id = project_id
-        self.location = location
-        
-        # Initialize Vertex AI
-        vertexai.init(project=project_id, location=location)
-        self.model = GenerativeModel("gemini-1.5-pro")
-        
-        # Initialize Firestore
-        self.db = firestore.Client()
-        
-        # Email configuration
-        self.smtp_server = "smtp.gmail.com"
-        self.smtp_port = 587
-        self.email_user = "your-email@company.com"  # Configure this
-        self.email_password = "your-app-password"   # Configure this
-        
-        # Business hours configuration
-        self.business_hours = {
-            "start": 9,  # 9 AM
-            "end": 18,   # 6 PM
-            "timezone": "UTC"
-        }
-        
-        # Meeting templates
-        self.email_templates = {
-            "initial_outreach": {
-                "subject": "Investment Evaluation Discussion - {startup_name}",
-                "body": """Dear {founder_name},
+# Email templates shared by all scheduling agent instances
+EMAIL_TEMPLATES = {
+    "initial_outreach": {
+        "subject": "Investment Evaluation Discussion - {startup_name}",
+        "body": """Dear {founder_name},
 
 We are currently evaluating {startup_name} for potential investment opportunities. Based on our initial analysis, we would like to schedule a brief discussion to learn more about your vision and progress.
 
@@ -95,10 +77,10 @@ Investment Evaluation Team
 
 ---
 This is an automated message from our AI scheduling system. Please reply with your preferred meeting times."""
-            },
-            "meeting_confirmation": {
-                "subject": "Meeting Confirmed - {meeting_date} at {meeting_time}",
-                "body": """Hi {founder_name},
+    },
+    "meeting_confirmation": {
+        "subject": "Meeting Confirmed - {meeting_date} at {meeting_time}",
+        "body": """Hi {founder_name},
 
 This confirms our meeting scheduled for {meeting_date} at {meeting_time} {timezone}.
 
@@ -114,10 +96,10 @@ If you need to reschedule, please reply to this email at least 2 hours before th
 
 Best regards,
 Investment Team"""
-            },
-            "reminder_24h": {
-                "subject": "Reminder: Meeting Tomorrow - {startup_name}",
-                "body": """Hi {founder_name},
+    },
+    "reminder_24h": {
+        "subject": "Reminder: Meeting Tomorrow - {startup_name}",
+        "body": """Hi {founder_name},
 
 This is a friendly reminder about our meeting tomorrow:
 
@@ -133,16 +115,74 @@ Looking forward to our conversation!
 
 Best regards,
 Investment Team"""
-            }
+    }
+}
+
+CLARIFICATION_EMAIL = """
+        Thank you for your response. To better assist you with scheduling, could you please provide:
+        
+        1. Your preferred meeting times (please include timezone)
+        2. Any specific requirements or constraints
+        
+        We're flexible and want to find a time that works best for you.
+        
+        Best regards,
+        Investment Team
+        """
+
+class StartupSchedulingAgent:
+    """AI agent for scheduling and coordinating founder meetings"""
+    
+    def __init__(self, project_id: str, location: str = "us-central1"):
+        self.project_id = project_id
+        self.location = location
+        
+        # Initialize Vertex AI
+        init_vertex_ai(project_id, location)
+        self.model_name = "gemini-1.5-pro"
+        self.model = get_generative_model(self.model_name)
+        self.response_cache = LLMResponseCache()
+        
+        # Initialize Firestore
+        self.db = get_firestore_client()
+        
+        # Email configuration
+        self.smtp_server = "smtp.gmail.com"
+        self.smtp_port = 587
+        self.email_user = "your-email@company.com"  # Configure this
+        self.email_password = "your-app-password"   # Configure this
+        
+        # Business hours configuration
+        self.business_hours = {
+            "start": 9,  # 9 AM
+            "end": 18,   # 6 PM
+            "timezone": "UTC"
         }
+        
+        # Meeting templates
+        self.email_templates = EMAIL_TEMPLATES
+    
+    async def _generate_text(self, prompt: str) -> str:
+        """Run the model on a prompt, reusing a cached response when caching is enabled"""
+        
+        cache_key = self.response_cache.make_key(type(self).__name__, self.model_name, prompt)
+        cached_text = self.response_cache.get(cache_key)
+        
+        if cached_text is not None:
+            return cached_text
+        
+        response = await self.model.generate_content_async(prompt)
+        self.response_cache.put(cache_key, response.text, type(self).__name__, self.model_name)
+        return response.text
     
     async def schedule_meeting(self, request: MeetingRequest) -> ScheduledMeeting:
         """Main method to schedule a meeting with a founder"""
-        logger.info(f"Starting scheduling process for {request.founder_email}")
+        logger.info("Starting scheduling process for %s", request.founder_email)
         
         try:
             # Step 1: Generate meeting ID
-            meeting_id = f"meeting_{request.startup_id}_{int(datetime.utcnow().timestamp())}"
+            now = datetime.utcnow()
+            meeting_id = f"meeting_{request.startup_id}_{int(now.timestamp())}"
             
             # Step 2: Find optimal meeting time
             optimal_time = await self._find_optimal_time(request.preferred_times)
@@ -162,30 +202,30 @@ Investment Team"""
                 duration_minutes=request.duration_minutes,
                 meeting_link=meeting_link,
                 status=MeetingStatus.PENDING,
-                created_at=datetime.utcnow()
+                created_at=now
             )
             
-            # Step 6: Save to database
-            await self._save_meeting(meeting)
+            # Step 6: Queue the meeting record and automated reminders, then
+            # write them to the database in a single batched commit
+            batch = self.db.batch()
+            await self._save_meeting(meeting, batch)
+            await self._schedule_reminders(meeting, batch)
+            await asyncio.to_thread(batch.commit)
             
-            # Step 7: Schedule automated reminders
-            await self._schedule_reminders(meeting)
-            
-            logger.info(f"Meeting scheduled successfully: {meeting_id}")
+            logger.info("Meeting scheduled successfully: %s", meeting_id)
             return meeting
             
         except Exception as e:
-            logger.error(f"Failed to schedule meeting: {str(e)}")
+            logger.error("Failed to schedule meeting: %s", e)
             raise
     
     async def _find_optimal_time(self, preferred_times: List[datetime]) -> datetime:
         """Find the optimal meeting time from preferred options"""
         
         # Filter times within business hours
-        business_times = []
-        for time in preferred_times:
-            if self.business_hours["start"] <= time.hour <= self.business_hours["end"]:
-                business_times.append(time)
+        start_hour = self.business_hours["start"]
+        end_hour = self.business_hours["end"]
+        business_times = [time for time in preferred_times if start_hour <= time.hour <= end_hour]
         
         if business_times:
             # Return the earliest available business hour time
@@ -211,16 +251,26 @@ Investment Team"""
     async def _send_initial_outreach(self, request: MeetingRequest, meeting_id: str):
         """Send initial outreach email to founder"""
         
-        # Get startup information
-        startup_doc = self.db.collection('startups').document(request.startup_id).get()
+        # Get startup name; only that field is read, so skip transferring the rest of the document
+        startup_doc = await asyncio.to_thread(
+            self.db.collection('startups').document(request.startup_id).get,
+            field_paths=['name']
+        )
         startup_name = "your startup"
         
         if startup_doc.exists:
             startup_data = startup_doc.to_dict()
             startup_name = startup_data.get('name', startup_name)
         
-        # Generate personalized email content
-        email_content = await self._generate_personalized_email(request, startup_name)
+        # Fill in the outreach template; only call the model when personalization is enabled
+        if PERSONALIZE_OUTREACH_EMAILS:
+            email_content = await self._generate_personalized_email(request, startup_name)
+        else:
+            email_content = self.email_templates["initial_outreach"]["body"].format(
+                founder_name=request.founder_name,
+                startup_name=startup_name,
+                duration=request.duration_minutes
+            )
         
         # Send email
         await self._send_email(
@@ -252,8 +302,8 @@ Investment Team"""
         Keep it under 150 words and maintain a friendly, professional tone.
         """
         
-        response = await self.model.generate_content_async(prompt)
-        return response.text
+        response_text = await self._generate_text(prompt)
+        return response_text
     
     async def _send_email(self, to_email: str, subject: str, body: str, meeting_id: str):
         """Send email using SMTP"""
@@ -269,22 +319,23 @@ Investment Team"""
             
             msg.attach(MIMEText(body, 'plain'))
             
-            # Connect to SMTP server and send
-            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-            server.starttls()
-            server.login(self.email_user, self.email_password)
-            
-            text = msg.as_string()
-            server.sendmail(self.email_user, to_email, text)
-            server.quit()
+            # Native async SMTP: concurrent sends overlap their round trips without holding worker threads
+            await aiosmtplib.send(
+                msg,
+                hostname=self.smtp_server,
+                port=self.smtp_port,
+                username=self.email_user,
+                password=self.email_password,
+                start_tls=True
+            )
             
-            logger.info(f"Email sent successfully to {to_email}")
+            logger.info("Email sent successfully to %s", to_email)
             
             # Log email in database
             await self._log_email(meeting_id, to_email, subject, body)
             
         except Exception as e:
-            logger.error(f"Failed to send email to {to_email}: {str(e)}")
+            logger.error("Failed to send email to %s: %s", to_email, e)
             raise
     
     async def _log_email(self, meeting_id: str, to_email: str, subject: str, body: str):
@@ -299,10 +350,10 @@ Investment Team"""
             'type': 'outbound'
         }
         
-        self.db.collection('email_logs').add(email_log)
+        await asyncio.to_thread(self.db.collection('email_logs').add, email_log)
     
-    async def _save_meeting(self, meeting: ScheduledMeeting):
-        """Save meeting details to database"""
+    async def _save_meeting(self, meeting: ScheduledMeeting, batch: firestore.WriteBatch):
+        """Queue meeting details on the given write batch"""
         
         meeting_data = {
             'meeting_id': meeting.meeting_id,
@@ -313,19 +364,19 @@ Investment Team"""
             'meeting_link': meeting.meeting_link,
             'status': meeting.status.value,
             'created_at': meeting.created_at,
-            'updated_at': datetime.utcnow()
+            'updated_at': meeting.created_at
         }
         
-        self.db.collection('meetings').document(meeting.meeting_id).set(meeting_data)
-        logger.info(f"Meeting saved to database: {meeting.meeting_id}")
+        batch.set(self.db.collection('meetings').document(meeting.meeting_id), meeting_data)
     
-    async def _schedule_reminders(self, meeting: ScheduledMeeting):
-        """Schedule automated reminder emails"""
+    async def _schedule_reminders(self, meeting: ScheduledMeeting, batch: firestore.WriteBatch):
+        """Queue automated reminder emails on the given write batch"""
         
         # Schedule 24-hour reminder
         reminder_time = meeting.scheduled_time - timedelta(hours=24)
+        now = datetime.utcnow()
         
-        if reminder_time > datetime.utcnow():
+        if reminder_time > now:
             # In a real implementation, you would use a task queue like Cloud Tasks
             # For now, we'll just log the reminder schedule
             reminder_data = {
@@ -333,11 +384,11 @@ Investment Team"""
                 'reminder_type': '24h_before',
                 'scheduled_for': reminder_time,
                 'status': 'scheduled',
-                'created_at': datetime.utcnow()
+                'created_at': now
             }
             
-            self.db.collection('reminders').add(reminder_data)
-            logger.info(f"24h reminder scheduled for meeting {meeting.meeting_id}")
+            batch.set(self.db.collection('reminders').document(), reminder_data)
+            logger.info("24h reminder scheduled for meeting %s", meeting.meeting_id)
     
     async def process_email_response(self, email_data: Dict[str, Any]) -> Dict[str, Any]:
         """Process incoming email responses from founders"""
@@ -355,10 +406,8 @@ Investment Team"""
                 # Extract proposed times
                 proposed_times = analysis.get('proposed_times', [])
                 
-                # Update meeting status
+                # Record the confirmation before emailing it, so a failed write never sends a confirmation
                 await self._update_meeting_status(meeting_id, MeetingStatus.CONFIRMED)
-                
-                # Send confirmation email
                 await self._send_confirmation_email(meeting_id, proposed_times[0] if proposed_times else None)
                 
                 return {"status": "confirmed", "meeting_id": meeting_id}
@@ -374,7 +423,7 @@ Investment Team"""
                 return {"status": "clarification_needed", "meeting_id": meeting_id}
                 
         except Exception as e:
-            logger.error(f"Failed to process email response: {str(e)}")
+            logger.error("Failed to process email response: %s", e)
             return {"status": "error", "error": str(e)}
     
     async def _analyze_email_response(self, email_body: str) -> Dict[str, Any]:
@@ -401,10 +450,10 @@ Investment Team"""
         }}
         """
         
-        response = await self.model.generate_content_async(prompt)
+        response_text = await self._generate_text(prompt)
         
         try:
-            return json.loads(response.text)
+            return json.loads(response_text)
         except json.JSONDecodeError:
             return {"contains_availability": False, "is_decline": False, "needs_clarification": True}
     
@@ -412,21 +461,21 @@ Investment Team"""
         """Update meeting status in database"""
         
         meeting_ref = self.db.collection('meetings').document(meeting_id)
-        meeting_ref.update({
+        await asyncio.to_thread(meeting_ref.update, {
             'status': status.value,
-            'updated_at': datetime.utcnow()
+            'updated_at': firestore.SERVER_TIMESTAMP
         })
         
-        logger.info(f"Meeting {meeting_id} status updated to {status.value}")
+        logger.info("Meeting %s status updated to %s", meeting_id, status.value)
     
     async def _send_confirmation_email(self, meeting_id: str, confirmed_time: Optional[datetime] = None):
         """Send meeting confirmation email"""
         
         # Get meeting details
-        meeting_doc = self.db.collection('meetings').document(meeting_id).get()
+        meeting_doc = await asyncio.to_thread(self.db.collection('meetings').document(meeting_id).get)
         
         if not meeting_doc.exists:
-            logger.error(f"Meeting {meeting_id} not found")
+            logger.error("Meeting %s not found", meeting_id)
             return
         
         meeting_data = meeting_doc.to_dict()
@@ -434,16 +483,20 @@ Investment Team"""
         # Use confirmed time or original scheduled time
         meeting_time = confirmed_time or meeting_data['scheduled_time']
         
+        # Format date/time labels once; both subject and body use them
+        meeting_date_label = meeting_time.strftime("%B %d, %Y")
+        meeting_time_label = meeting_time.strftime("%I:%M %p")
+        
         # Format email content
         subject = self.email_templates["meeting_confirmation"]["subject"].format(
-            meeting_date=meeting_time.strftime("%B %d, %Y"),
-            meeting_time=meeting_time.strftime("%I:%M %p")
+            meeting_date=meeting_date_label,
+            meeting_time=meeting_time_label
         )
         
         body = self.email_templates["meeting_confirmation"]["body"].format(
             founder_name=meeting_data.get('founder_name', 'there'),
-            meeting_date=meeting_time.strftime("%B %d, %Y"),
-            meeting_time=meeting_time.strftime("%I:%M %p"),
+            meeting_date=meeting_date_label,
+            meeting_time=meeting_time_label,
             timezone="UTC",
             duration=meeting_data['duration_minutes'],
             meeting_link=meeting_data['meeting_link'],
@@ -461,32 +514,21 @@ Investment Team"""
     async def _request_clarification(self, meeting_id: str, founder_email: str):
         """Request clarification from founder"""
         
-        clarification_email = """
-        Thank you for your response. To better assist you with scheduling, could you please provide:
-        
-        1. Your preferred meeting times (please include timezone)
-        2. Any specific requirements or constraints
-        
-        We're flexible and want to find a time that works best for you.
-        
-        Best regards,
-        Investment Team
-        """
-        
         await self._send_email(
             to_email=founder_email,
             subject="Clarification Needed - Meeting Scheduling",
-            body=clarification_email,
+            body=CLARIFICATION_EMAIL,
             meeting_id=meeting_id
         )
 
 # Usage example
-async def main():
+async def main(project_id: str):
     """Example usage of the scheduling agent"""
     
-    agent = StartupSchedulingAgent(project_id="your-project-id")
+    agent = StartupSchedulingAgent(project_id=project_id)
     
     # Example meeting request
+    now = datetime.utcnow()
     request = MeetingRequest(
         startup_id="startup-123",
         founder_email="founder@startup.com",
@@ -494,8 +536,8 @@ async def main():
         meeting_type="initial_evaluation",
         duration_minutes=60,
         preferred_times=[
-            datetime.utcnow() + timedelta(days=1, hours=2),
-            datetime.utcnow() + timedelta(days=2, hours=3)
+            now + timedelta(days=1, hours=2),
+            now + timedelta(days=2, hours=3)
         ]
     )
     
@@ -503,4 +545,9 @@ async def main():
     print(f"Meeting scheduled: {meeting.meeting_id}")
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Schedule a sample meeting with the scheduling agent")
+    parser.add_argument("--project-id", default=os.getenv("GOOGLE_CLOUD_PROJECT", "your-project-id"),
+                        help="Google Cloud project (defaults to $GOOGLE_CLOUD_PROJECT)")
+    args = parser.parse_args()
+    
+    asyncio.run(main(args.project_id))
@@ -3,32 +3,52 @@ Startup Evaluation Platform - Main API Service
 FastAPI-based backend service for coordinating AI agents and managing evaluations
 """
 
-from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
-from datetime import datetime
+from datetime import datetime, timedelta
 import uuid
 import asyncio
+import functools
+import httpx
+import orjson
+import os
+import sys
+import threading
+import time
 from enum import Enum
 
 # Google Cloud imports
 from google.cloud import firestore
 from google.cloud import storage
-from google.cloud import aiplatform
-from vertexai.preview.generative_models import GenerativeModel
+from vertexai.generative_models import GenerativeModel
+
+# Running this file directly puts backend/api/ on sys.path instead of the project root
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from agents.clients import get_default_credentials, get_firestore_client, get_generative_model, init_vertex_ai
 
 app = FastAPI(
     title="Startup Evaluation Platform API",
     description="AI-powered startup evaluation and investment memo generation",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
+# CORS origins: an exact comma-separated list (matched by set lookup) plus an optional regex for
+# families like Cloud Run preview URLs; Starlette compiles the regex once, not per request
+CORS_ALLOWED_ORIGINS = [origin.strip() for origin in os.getenv("CORS_ALLOWED_ORIGINS", "*").split(",") if origin.strip()]
+CORS_ORIGIN_REGEX = os.getenv("CORS_ORIGIN_REGEX") or None
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Configure appropriately for production
+    allow_origins=CORS_ALLOWED_ORIGINS,
+    allow_origin_regex=CORS_ORIGIN_REGEX,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -37,10 +57,85 @@ app.add_middleware(
 # Security
 security = HTTPBearer()
 
-# Initialize Google Cloud clients
-db = firestore.Client()
-storage_client = storage.Client()
-aiplatform.init(project="your-project-id", location="us-central1")
+# Google Cloud clients are created on first use, so importing the API makes no network calls
+def get_db() -> firestore.Client:
+    """Process-wide Firestore client, created on first use"""
+    return get_firestore_client()
+
+@functools.lru_cache(maxsize=1)
+def ensure_vertex_ai():
+    """Initialize Vertex AI once per process"""
+    init_vertex_ai(os.getenv("GOOGLE_CLOUD_PROJECT", "your-project-id"), "us-central1")
+
+@functools.lru_cache(maxsize=1)
+def get_storage_client() -> storage.Client:
+    """Cloud Storage client, created on first use"""
+    credentials, project_id = get_default_credentials()
+    return storage.Client(project=project_id, credentials=credentials)
+
+# Response rendering
+def _json_default(obj: Any) -> Any:
+    """orjson fallback; Firestore returns timestamps as a datetime subclass orjson does not handle"""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+class FirestoreJSONResponse(ORJSONResponse):
+    """Renders Firestore data directly with orjson, skipping FastAPI's jsonable_encoder pass"""
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+
+# Response caching
+class TTLCache:
+    """Small thread-safe in-process cache whose entries expire after a fixed number of seconds"""
+    
+    def __init__(self, ttl_seconds: float, max_entries: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[Any, Any] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key: Any) -> Optional[Any]:
+        """Return the cached value, or None if it is missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            
+            return value
+    
+    def set(self, key: Any, value: Any):
+        """Store a value; the oldest entry is evicted once the cache is full"""
+        with self._lock:
+            if key not in self._entries and len(self._entries) >= self.max_entries:
+                del self._entries[next(iter(self._entries))]
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+    
+    def invalidate(self, key: Any):
+        """Drop one entry, if present"""
+        with self._lock:
+            self._entries.pop(key, None)
+    
+    def clear(self):
+        """Drop every cached entry"""
+        with self._lock:
+            self._entries.clear()
+
+# Rendered listing bodies; dashboards poll these, so a short TTL collapses repeated identical queries.
+# Each server worker has its own caches: invalidation only reaches the worker that made the change, and
+# the others can serve stale entries for up to their TTL
+evaluation_list_cache = TTLCache(ttl_seconds=float(os.getenv("LIST_CACHE_TTL_SECONDS", "10")))
+
+# Single evaluation/interview reads, keyed by caller and document ID; clients poll these for status while agents run
+STATUS_CACHE_TTL_SECONDS = float(os.getenv("STATUS_CACHE_TTL_SECONDS", "2"))
+evaluation_cache = TTLCache(ttl_seconds=STATUS_CACHE_TTL_SECONDS)
+interview_cache = TTLCache(ttl_seconds=STATUS_CACHE_TTL_SECONDS)
 
 # Pydantic Models
 class EvaluationStatus(str, Enum):
@@ -99,6 +194,15 @@ class InterviewRequest(BaseModel):
     preferred_times: List[datetime] = Field(..., description="Preferred meeting times")
     duration_minutes: int = Field(60, description="Interview duration in minutes")
 
+class BatchSubRequest(BaseModel):
+    id: str = Field(..., description="Client-chosen identifier echoed back in the response")
+    method: str = Field("GET", description="HTTP method")
+    url: str = Field(..., description="API path, e.g. /evaluations/abc123")
+    body: Optional[Dict[str, Any]] = Field(None, description="JSON body for write requests")
+
+class BatchRequest(BaseModel):
+    requests: List[BatchSubRequest] = Field(..., max_length=20, description="Sub-requests to run in parallel")
+
 class InterviewResponse(BaseModel):
     interview_id: str
     startup_id: str
@@ -111,26 +215,32 @@ class InterviewResponse(BaseModel):
 class EvaluationAgentService:
     """Service for interacting with the Evaluation Agent"""
     
-    def __init__(self):
-        self.model = GenerativeModel("gemini-1.5-pro")
+    @functools.cached_property
+    def model(self) -> GenerativeModel:
+        """Model for the evaluation workflow, created on first use"""
+        ensure_vertex_ai()
+        return get_generative_model("gemini-1.5-pro")
     
     async def start_evaluation(self, evaluation_data: Dict[str, Any]) -> str:
         """Start evaluation process with the AI agent"""
         try:
             # Create evaluation record in Firestore
-            evaluation_ref = db.collection('evaluations').document()
+            evaluation_ref = get_db().collection('evaluations').document()
             evaluation_id = evaluation_ref.id
             
+            now = datetime.utcnow()
             evaluation_doc = {
+                'startup_id': evaluation_data['startup_id'],
+                'user_id': evaluation_data['user_id'],
                 'startup_info': evaluation_data['startup_info'],
                 'founders': evaluation_data['founders'],
                 'status': EvaluationStatus.IN_PROGRESS,
-                'created_at': datetime.utcnow(),
-                'updated_at': datetime.utcnow(),
+                'created_at': now,
+                'updated_at': now,
                 'agent_status': 'initializing'
             }
             
-            evaluation_ref.set(evaluation_doc)
+            await asyncio.to_thread(evaluation_ref.set, evaluation_doc)
             
             # Trigger agent workflow (async)
             asyncio.create_task(self._run_evaluation_workflow(evaluation_id, evaluation_data))
@@ -143,7 +253,7 @@ class EvaluationAgentService:
     async def _run_evaluation_workflow(self, evaluation_id: str, evaluation_data: Dict[str, Any]):
         """Run the complete evaluation workflow"""
         try:
-            evaluation_ref = db.collection('evaluations').document(evaluation_id)
+            evaluation_ref = get_db().collection('evaluations').document(evaluation_id)
             
             # Step 1: Data extraction and preparation
             await self._update_status(evaluation_ref, "extracting_data")
@@ -187,26 +297,30 @@ class EvaluationAgentService:
             })
             
             # Final update
-            evaluation_ref.update({
+            await asyncio.to_thread(evaluation_ref.update, {
                 'status': EvaluationStatus.COMPLETED,
                 'scores': scores,
                 'report': report,
-                'updated_at': datetime.utcnow(),
-                'completed_at': datetime.utcnow()
+                'updated_at': firestore.SERVER_TIMESTAMP,
+                'completed_at': firestore.SERVER_TIMESTAMP
             })
+            evaluation_cache.invalidate((evaluation_data['user_id'], evaluation_id))
+            evaluation_list_cache.clear()
             
         except Exception as e:
-            evaluation_ref.update({
+            await asyncio.to_thread(evaluation_ref.update, {
                 'status': EvaluationStatus.FAILED,
                 'error': str(e),
-                'updated_at': datetime.utcnow()
+                'updated_at': firestore.SERVER_TIMESTAMP
             })
+            evaluation_cache.invalidate((evaluation_data['user_id'], evaluation_id))
+            evaluation_list_cache.clear()
     
     async def _update_status(self, evaluation_ref, status: str):
         """Update evaluation status"""
-        evaluation_ref.update({
+        await asyncio.to_thread(evaluation_ref.update, {
             'agent_status': status,
-            'updated_at': datetime.utcnow()
+            'updated_at': firestore.SERVER_TIMESTAMP
         })
     
     async def _extract_key_data(self, evaluation_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -265,7 +379,7 @@ class SchedulingAgentService:
     async def schedule_interview(self, interview_request: InterviewRequest) -> str:
         """Schedule interview with founder"""
         try:
-            interview_ref = db.collection('interviews').document()
+            interview_ref = get_db().collection('interviews').document()
             interview_id = interview_ref.id
             
             interview_doc = {
@@ -275,11 +389,11 @@ class SchedulingAgentService:
                 'preferred_times': [t.isoformat() for t in interview_request.preferred_times],
                 'duration_minutes': interview_request.duration_minutes,
                 'status': 'scheduling',
-                'created_at': datetime.utcnow(),
-                'updated_at': datetime.utcnow()
+                'created_at': firestore.SERVER_TIMESTAMP,
+                'updated_at': firestore.SERVER_TIMESTAMP
             }
             
-            interview_ref.set(interview_doc)
+            await asyncio.to_thread(interview_ref.set, interview_doc)
             
             # Trigger scheduling workflow
             asyncio.create_task(self._run_scheduling_workflow(interview_id, interview_request))
@@ -333,8 +447,8 @@ async def create_evaluation(
         # Prepare evaluation data
         evaluation_data = {
             'startup_id': startup_id,
-            'startup_info': request.startup_info.dict(),
-            'founders': [f.dict() for f in request.founders],
+            'startup_info': request.startup_info.model_dump(),
+            'founders': [f.model_dump() for f in request.founders],
             'documents': request.documents or [],
             'additional_info': request.additional_info or {},
             'priority': request.priority,
@@ -344,62 +458,97 @@ async def create_evaluation(
         # Start evaluation
         evaluation_id = await evaluation_service.start_evaluation(evaluation_data)
         
+        # Listings from this worker include the new evaluation at once; other workers catch up within LIST_CACHE_TTL_SECONDS
+        evaluation_list_cache.clear()
+        
+        now = datetime.utcnow()
         return EvaluationResponse(
             evaluation_id=evaluation_id,
             startup_id=startup_id,
             status=EvaluationStatus.IN_PROGRESS,
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow(),
-            estimated_completion=datetime.utcnow().replace(hour=datetime.utcnow().hour + 2)
+            created_at=now,
+            updated_at=now,
+            estimated_completion=now + timedelta(hours=2)
         )
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# Read-only endpoints below only make blocking Firestore calls, so they are plain functions
+# that FastAPI runs in its threadpool instead of stalling the event loop
 @app.get("/evaluations/{evaluation_id}", response_model=EvaluationResponse)
-async def get_evaluation(
+def get_evaluation(
     evaluation_id: str,
     current_user: dict = Depends(get_current_user)
 ):
     """Get evaluation status and results"""
+    cache_key = (current_user['user_id'], evaluation_id)
+    cached_response = evaluation_cache.get(cache_key)
+    if cached_response is not None:
+        return cached_response
+    
     try:
-        evaluation_ref = db.collection('evaluations').document(evaluation_id)
+        evaluation_ref = get_db().collection('evaluations').document(evaluation_id)
         evaluation_doc = evaluation_ref.get()
         
         if not evaluation_doc.exists:
             raise HTTPException(status_code=404, detail="Evaluation not found")
         
         data = evaluation_doc.to_dict()
+        report = data.get('report', {})
         
-        return EvaluationResponse(
+        response = EvaluationResponse(
             evaluation_id=evaluation_id,
             startup_id=data.get('startup_id', ''),
             status=EvaluationStatus(data.get('status', 'pending')),
             scores=EvaluationScores(**data['scores']) if data.get('scores') else None,
-            summary=data.get('report', {}).get('summary'),
-            recommendations=data.get('report', {}).get('recommendations'),
-            risk_factors=data.get('report', {}).get('risk_factors'),
+            summary=report.get('summary'),
+            recommendations=report.get('recommendations'),
+            risk_factors=report.get('risk_factors'),
             created_at=data['created_at'],
             updated_at=data['updated_at']
         )
+        evaluation_cache.set(cache_key, response)
+        return response
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/evaluations")
-async def list_evaluations(
+def list_evaluations(
     status: Optional[EvaluationStatus] = None,
-    limit: int = 10,
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
     current_user: dict = Depends(get_current_user)
 ):
-    """List evaluations for the current user"""
+    """List evaluations for the current user, newest first; pass next_cursor back to get the next page"""
+    cache_key = (current_user['user_id'], status, limit, cursor)
+    cached_body = evaluation_list_cache.get(cache_key)
+    if cached_body is not None:
+        return Response(content=cached_body, media_type="application/json")
+    
     try:
-        query = db.collection('evaluations').where('user_id', '==', current_user['user_id'])
+        query = get_db().collection('evaluations').where('user_id', '==', current_user['user_id'])
         
         if status:
             query = query.where('status', '==', status.value)
         
-        query = query.order_by('created_at', direction=firestore.Query.DESCENDING).limit(limit)
+        # Document ID breaks created_at ties so the cursor position is unambiguous
+        query = query.order_by('created_at', direction=firestore.Query.DESCENDING)
+        query = query.order_by('__name__', direction=firestore.Query.DESCENDING)
+        
+        # Keyset pagination: resume after the cursor document instead of skipping rows with an offset
+        if cursor:
+            cursor_doc = get_db().collection('evaluations').document(cursor).get(field_paths=['created_at', 'user_id'])
+            # A cursor must be one of the caller's own evaluations; anything else is rejected the same way
+            if not cursor_doc.exists or (cursor_doc.to_dict() or {}).get('user_id') != current_user['user_id']:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            query = query.start_after(cursor_doc)
+        
+        query = query.limit(limit)
+        
+        # Only fetch the fields the listing needs instead of full evaluation documents
+        query = query.select(['startup_info.name', 'status', 'created_at', 'scores.overall_score'])
         
         evaluations = []
         for doc in query.stream():
@@ -412,8 +561,14 @@ async def list_evaluations(
                 'overall_score': data.get('scores', {}).get('overall_score')
             })
         
-        return {"evaluations": evaluations}
+        next_cursor = evaluations[-1]['evaluation_id'] if len(evaluations) == limit else None
+        
+        response = FirestoreJSONResponse({"evaluations": evaluations, "next_cursor": next_cursor})
+        evaluation_list_cache.set(cache_key, response.body)
+        return response
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -437,19 +592,26 @@ async def schedule_interview(
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/interviews/{interview_id}")
-async def get_interview(
+def get_interview(
     interview_id: str,
     current_user: dict = Depends(get_current_user)
 ):
     """Get interview details and status"""
+    cache_key = (current_user['user_id'], interview_id)
+    cached_body = interview_cache.get(cache_key)
+    if cached_body is not None:
+        return Response(content=cached_body, media_type="application/json")
+    
     try:
-        interview_ref = db.collection('interviews').document(interview_id)
+        interview_ref = get_db().collection('interviews').document(interview_id)
         interview_doc = interview_ref.get()
         
         if not interview_doc.exists:
             raise HTTPException(status_code=404, detail="Interview not found")
         
-        return interview_doc.to_dict()
+        response = FirestoreJSONResponse(interview_doc.to_dict())
+        interview_cache.set(cache_key, response.body)
+        return response
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -474,17 +636,17 @@ async def generate_investment_memo(
 ):
     """Generate investment memo for a startup"""
     try:
-        # Get evaluation data
-        evaluations_query = db.collection('evaluations').where('startup_id', '==', startup_id)
-        evaluations = list(evaluations_query.stream())
+        # Get evaluation and interview data; the queries are independent, so run them together
+        evaluations_query = get_db().collection('evaluations').where('startup_id', '==', startup_id)
+        interviews_query = get_db().collection('interviews').where('startup_id', '==', startup_id)
+        evaluations, interviews = await asyncio.gather(
+            asyncio.to_thread(list, evaluations_query.stream()),
+            asyncio.to_thread(list, interviews_query.stream())
+        )
         
         if not evaluations:
             raise HTTPException(status_code=404, detail="No evaluation found for this startup")
         
-        # Get interview data
-        interviews_query = db.collection('interviews').where('startup_id', '==', startup_id)
-        interviews = list(interviews_query.stream())
-        
         # Generate memo using AI
         memo_data = {
             'startup_id': startup_id,
@@ -494,14 +656,72 @@ async def generate_investment_memo(
         }
         
         # Store memo
-        memo_ref = db.collection('investment_memos').document()
-        memo_ref.set(memo_data)
+        memo_ref = get_db().collection('investment_memos').document()
+        await asyncio.to_thread(memo_ref.set, memo_data)
         
-        return {"memo_id": memo_ref.id, "memo_data": memo_data}
+        return FirestoreJSONResponse({"memo_id": memo_ref.id, "memo_data": memo_data})
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# Set on sub-requests the batch endpoint dispatches in-process; a request carrying it may not batch again
+BATCH_SUBREQUEST_HEADER = "x-batch-subrequest"
+BATCH_BASE_URL = "http://batch"
+
+def _sub_response_body(response: httpx.Response) -> Any:
+    """Decode a sub-response body, falling back to text for non-JSON error pages"""
+    if not response.content:
+        return None
+    try:
+        return response.json()
+    except ValueError:
+        return response.text
+
+@app.post("/batch")
+async def batch(
+    batch_request: BatchRequest,
+    request: Request,
+    current_user: dict = Depends(get_current_user)
+):
+    """Run several API calls in one round-trip; sub-requests are dispatched in-process and in parallel"""
+    
+    if BATCH_SUBREQUEST_HEADER in request.headers:
+        raise HTTPException(status_code=400, detail="Batch requests cannot be nested")
+    
+    # Sub-requests run as the caller and are marked so they cannot fan out again
+    headers = {BATCH_SUBREQUEST_HEADER: "1"}
+    if "authorization" in request.headers:
+        headers["authorization"] = request.headers["authorization"]
+    
+    # raise_app_exceptions=False turns a failing handler into a 500 response instead of failing the batch
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url=BATCH_BASE_URL) as client:
+        sub_requests = []
+        for sub in batch_request.requests:
+            # Check the resolved URL, so spellings like "batch" or "//batch/batch" are caught too
+            sub_request = client.build_request(sub.method, sub.url, json=sub.body, headers=headers)
+            if httpx.URL(sub.url).is_absolute_url or sub_request.url.host != client.base_url.host:
+                raise HTTPException(status_code=400, detail=f"Sub-request {sub.id} must use a relative API path")
+            if sub_request.url.path.rstrip("/") == "/batch":
+                raise HTTPException(status_code=400, detail="Batch requests cannot be nested")
+            sub_requests.append(sub_request)
+        
+        sub_responses = await asyncio.gather(
+            *(client.send(sub_request) for sub_request in sub_requests),
+            return_exceptions=True
+        )
+    
+    # One failing sub-request is reported in its own entry rather than failing the whole batch
+    responses = []
+    for sub, sub_response in zip(batch_request.requests, sub_responses):
+        if isinstance(sub_response, Exception):
+            responses.append({"id": sub.id, "status": 500, "body": {"detail": str(sub_response)}})
+        else:
+            responses.append({"id": sub.id, "status": sub_response.status_code, "body": _sub_response_body(sub_response)})
+    
+    # Sub-response bodies are already plain JSON, so there is nothing for jsonable_encoder to convert
+    return ORJSONResponse({"responses": responses})
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -4,154 +4,215 @@ Orchestrates all AI agents and provides unified interface
 """
 
 import asyncio
+import importlib.util
+import json
 import logging
 import os
+import sys
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import AsyncIterator, Dict, Any, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 
+import anyio.to_thread
+import orjson
 from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 import uvicorn
 
 # Import our agents
 from agents.evaluation_agent import StartupEvaluationAgent
 from agents.scheduling_agent import StartupSchedulingAgent, MeetingRequest
 from agents.interview_agent import StartupInterviewAgent
+from agents.clients import get_generative_model
+from agents.prompt_utils import to_prompt_json
 
 # Import API
-from backend.api.startup_evaluation_api import app as api_app
+from backend.api.startup_evaluation_api import app as api_app, CORS_ALLOWED_ORIGINS, CORS_ORIGIN_REGEX
 
-# Configure logging
+# Configure logging; force replaces the INFO default the agent modules set up on import
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+DEBUG = os.getenv("DEBUG", "false").lower() in ("1", "true", "yes")
 logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    level=LOG_LEVEL,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    force=True
 )
 logger = logging.getLogger(__name__)
 
+# Top-level keys every evaluation request must provide
+REQUIRED_STARTUP_FIELDS = ("startup_info", "founders")
+
+# Minimum overall score (0-100) for a startup to move on to the founder interview;
+# startups below it skip the scheduling, interview and memo model calls entirely
+INTERVIEW_SCORE_THRESHOLD = float(os.getenv("INTERVIEW_MIN_SCORE", "60"))
+
+# Worker threads for blocking client calls (Firestore, SMTP, TTS), used both for asyncio.to_thread
+# offloads and for the threadpool FastAPI runs plain `def` endpoints in
+BLOCKING_IO_THREADS = int(os.getenv("BLOCKING_IO_THREADS", "64"))
+
+def _timestamped_id(*parts: str) -> str:
+    """Build an identifier like ``memo_<startup_id>_<unix seconds>``"""
+    return "_".join((*parts, str(int(datetime.utcnow().timestamp()))))
+
+def _prepare_startup_data(startup_data: Dict[str, Any]):
+    """Validate required fields and assign a startup_id if the request has none"""
+    
+    for field in REQUIRED_STARTUP_FIELDS:
+        if field not in startup_data:
+            raise HTTPException(status_code=400, detail=f"Missing required field: {field}")
+    
+    if "startup_id" not in startup_data:
+        startup_data["startup_id"] = _timestamped_id("startup")
+
+def _summarize_evaluation(evaluation_result) -> Dict[str, Any]:
+    """Response-facing summary of an evaluation result"""
+    return {
+        "scores": evaluation_result.scores,
+        "recommendations": evaluation_result.recommendations,
+        "risk_factors": evaluation_result.risk_factors,
+        "confidence_score": evaluation_result.confidence_score
+    }
+
 class StartupEvaluationOrchestrator:
     """Main orchestrator for the startup evaluation platform"""
     
+    # Agents per (project_id, location); each owns model and database clients that are costly to build
+    _agent_cache: Dict[Tuple[str, str], Tuple[StartupEvaluationAgent, StartupSchedulingAgent, StartupInterviewAgent]] = {}
+    
     def __init__(self, project_id: str, location: str = "us-central1"):
         self.project_id = project_id
         self.location = location
         
-        # Initialize agents
-        self.evaluation_agent = StartupEvaluationAgent(project_id, location)
-        self.scheduling_agent = StartupSchedulingAgent(project_id, location)
-        self.interview_agent = StartupInterviewAgent(project_id, location)
+        # Initialize agents once per project/location and share them across orchestrators
+        cache_key = (project_id, location)
+        if cache_key not in self._agent_cache:
+            self._agent_cache[cache_key] = (
+                StartupEvaluationAgent(project_id, location),
+                StartupSchedulingAgent(project_id, location),
+                StartupInterviewAgent(project_id, location)
+            )
+        
+        self.evaluation_agent, self.scheduling_agent, self.interview_agent = self._agent_cache[cache_key]
         
         logger.info("Startup Evaluation Platform initialized")
     
-    async def run_complete_evaluation_pipeline(self, startup_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def run_complete_evaluation_pipeline(self, startup_data: Dict[str, Any], force_refresh: bool = False) -> Dict[str, Any]:
         """Run the complete evaluation pipeline for a startup"""
         
+        async for event in self.stream_evaluation_pipeline(startup_data, force_refresh):
+            if event["stage"] == "complete":
+                return event["result"]
+    
+    async def stream_evaluation_pipeline(self, startup_data: Dict[str, Any], force_refresh: bool = False) -> AsyncIterator[Dict[str, Any]]:
+        """Run the evaluation pipeline, yielding each phase's result as soon as it is ready
+        
+        The final event is always ``{"stage": "complete", "result": <pipeline summary>}``.
+        """
+        
         startup_id = startup_data.get('startup_id')
-        logger.info(f"Starting complete evaluation pipeline for startup: {startup_id}")
+        logger.info("Starting complete evaluation pipeline for startup: %s", startup_id)
         
         try:
             # Phase 1: Initial Evaluation
             logger.info("Phase 1: Running initial evaluation...")
-            evaluation_result = await self.evaluation_agent.evaluate_startup(startup_data)
+            evaluation_result = await self.evaluation_agent.evaluate_startup(startup_data, force_refresh=force_refresh)
+            evaluation_summary = _summarize_evaluation(evaluation_result)
+            yield {"stage": "evaluation", "result": evaluation_summary}
+            
+            if evaluation_result.reused:
+                # This exact submission went through the pipeline before; don't contact the founder again
+                logger.info("Reusing completed evaluation for startup %s; skipping interview and memo", startup_id)
+                summary = {
+                    "status": "already_evaluated",
+                    "startup_id": startup_id,
+                    "evaluation_result": evaluation_summary,
+                    "evaluated_at": evaluation_result.timestamp.isoformat()
+                }
             
             # Phase 2: Schedule Interview (if needed)
-            if evaluation_result.scores.get('overall_score', 0) >= 60:  # Threshold for interview
+            elif evaluation_result.scores.get('overall_score', 0) >= INTERVIEW_SCORE_THRESHOLD:
                 logger.info("Phase 2: Scheduling founder interview...")
                 
                 founder_info = startup_data.get('founders', [{}])[0]
+                founder_email = founder_info.get('email', '')
+                founder_name = founder_info.get('name', '')
                 meeting_request = MeetingRequest(
                     startup_id=startup_id,
-                    founder_email=founder_info.get('email', ''),
-                    founder_name=founder_info.get('name', ''),
+                    founder_email=founder_email,
+                    founder_name=founder_name,
                     meeting_type="evaluation_interview",
                     duration_minutes=60,
                     preferred_times=[datetime.utcnow().replace(hour=14, minute=0)]  # Default 2 PM
                 )
                 
                 scheduled_meeting = await self.scheduling_agent.schedule_meeting(meeting_request)
+                meeting_details = {
+                    "meeting_id": scheduled_meeting.meeting_id,
+                    "scheduled_time": scheduled_meeting.scheduled_time.isoformat(),
+                    "meeting_link": scheduled_meeting.meeting_link
+                }
+                yield {"stage": "meeting", "result": meeting_details}
                 
                 # Phase 3: Conduct Interview (simulated for demo)
                 logger.info("Phase 3: Conducting AI interview...")
                 interview_session = await self.interview_agent.conduct_interview(
                     startup_id=startup_id,
-                    founder_email=founder_info.get('email', ''),
-                    founder_name=founder_info.get('name', '')
+                    founder_email=founder_email,
+                    founder_name=founder_name
                 )
+                interview_summary = {
+                    "session_id": interview_session.session_id,
+                    "overall_sentiment": interview_session.overall_sentiment,
+                    "key_insights": interview_session.key_insights,
+                    "red_flags": interview_session.red_flags
+                }
+                yield {"stage": "interview", "result": interview_summary}
                 
                 # Phase 4: Generate Final Investment Memo
                 logger.info("Phase 4: Generating investment memo...")
                 investment_memo = await self._generate_investment_memo(
                     evaluation_result, interview_session
                 )
+                yield {"stage": "investment_memo", "result": investment_memo}
                 
-                return {
+                summary = {
                     "status": "completed",
                     "startup_id": startup_id,
-                    "evaluation_result": {
-                        "scores": evaluation_result.scores,
-                        "recommendations": evaluation_result.recommendations,
-                        "risk_factors": evaluation_result.risk_factors,
-                        "confidence_score": evaluation_result.confidence_score
-                    },
-                    "interview_session": {
-                        "session_id": interview_session.session_id,
-                        "overall_sentiment": interview_session.overall_sentiment,
-                        "key_insights": interview_session.key_insights,
-                        "red_flags": interview_session.red_flags
-                    },
+                    "evaluation_result": evaluation_summary,
+                    "interview_session": interview_summary,
                     "investment_memo": investment_memo,
-                    "meeting_details": {
-                        "meeting_id": scheduled_meeting.meeting_id,
-                        "scheduled_time": scheduled_meeting.scheduled_time.isoformat(),
-                        "meeting_link": scheduled_meeting.meeting_link
-                    }
+                    "meeting_details": meeting_details
                 }
             else:
                 logger.info("Startup did not meet threshold for interview")
-                return {
+                summary = {
                     "status": "evaluation_only",
                     "startup_id": startup_id,
-                    "evaluation_result": {
-                        "scores": evaluation_result.scores,
-                        "recommendations": evaluation_result.recommendations,
-                        "risk_factors": evaluation_result.risk_factors,
-                        "confidence_score": evaluation_result.confidence_score
-                    },
+                    "evaluation_result": evaluation_summary,
                     "decision": "pass",
-                    "reason": f"Overall score {evaluation_result.scores.get('overall_score', 0):.1f} below interview threshold of 60"
+                    "reason": f"Overall score {evaluation_result.scores.get('overall_score', 0):.1f} below interview threshold of {INTERVIEW_SCORE_THRESHOLD:g}"
                 }
                 
         except Exception as e:
-            logger.error(f"Pipeline failed for startup {startup_id}: {str(e)}")
-            return {
+            logger.error("Pipeline failed for startup %s: %s", startup_id, e, exc_info=True)
+            summary = {
                 "status": "failed",
                 "startup_id": startup_id,
                 "error": str(e)
             }
+        
+        yield {"stage": "complete", "result": summary}
     
     async def _generate_investment_memo(self, evaluation_result, interview_session) -> Dict[str, Any]:
         """Generate comprehensive investment memo"""
         
-        from vertexai.generative_models import GenerativeModel
-        import json
-        
-        model = GenerativeModel("gemini-1.5-pro")
+        # Agents have already initialized Vertex AI; the memo shares their model client
+        model = get_generative_model("gemini-1.5-pro")
         
         prompt = f"""
-        Generate a comprehensive investment memo based on the following evaluation data:
-        
-        EVALUATION SCORES:
-        {json.dumps(evaluation_result.scores, indent=2)}
-        
-        EVALUATION INSIGHTS:
-        Recommendations: {evaluation_result.recommendations}
-        Risk Factors: {evaluation_result.risk_factors}
-        Confidence Score: {evaluation_result.confidence_score}
-        
-        INTERVIEW INSIGHTS:
-        Overall Sentiment: {interview_session.overall_sentiment}
-        Key Insights: {interview_session.key_insights}
-        Red Flags: {interview_session.red_flags}
+        Generate a comprehensive investment memo based on the evaluation data below.
         
         Create a professional investment memo with the following sections:
         1. Executive Summary
@@ -165,18 +226,32 @@ class StartupEvaluationOrchestrator:
         9. Next Steps
         
         Format as a structured JSON object with each section as a key.
+        
+        EVALUATION SCORES:
+        {to_prompt_json(evaluation_result.scores)}
+        
+        EVALUATION INSIGHTS:
+        Recommendations: {evaluation_result.recommendations}
+        Risk Factors: {evaluation_result.risk_factors}
+        Confidence Score: {evaluation_result.confidence_score}
+        
+        INTERVIEW INSIGHTS:
+        Overall Sentiment: {interview_session.overall_sentiment}
+        Key Insights: {interview_session.key_insights}
+        Red Flags: {interview_session.red_flags}
         """
         
         response = await model.generate_content_async(prompt)
+        memo_id = _timestamped_id("memo", evaluation_result.startup_id)
         
         try:
             memo = json.loads(response.text)
             memo["generated_at"] = datetime.utcnow().isoformat()
-            memo["memo_id"] = f"memo_{evaluation_result.startup_id}_{int(datetime.utcnow().timestamp())}"
+            memo["memo_id"] = memo_id
             return memo
         except json.JSONDecodeError:
             return {
-                "memo_id": f"memo_{evaluation_result.startup_id}_{int(datetime.utcnow().timestamp())}",
+                "memo_id": memo_id,
                 "executive_summary": response.text,
                 "generated_at": datetime.utcnow().isoformat(),
                 "status": "generated_with_fallback"
@@ -187,27 +262,69 @@ class StartupEvaluationOrchestrator:
 async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting Startup Evaluation Platform...")
+    
+    # The default executor is sized for CPU work; blocking I/O needs more threads to overlap requests
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=BLOCKING_IO_THREADS, thread_name_prefix="blocking-io")
+    )
+    anyio.to_thread.current_default_thread_limiter().total_tokens = BLOCKING_IO_THREADS
     yield
     # Shutdown
     logger.info("Shutting down Startup Evaluation Platform...")
 
+# Health checks
+def _health_payload() -> Dict[str, Any]:
+    """Health status reported by the /health endpoint"""
+    return {
+        "status": "healthy",
+        "timestamp": datetime.utcnow().isoformat(),
+        "services": {
+            "evaluation_agent": "healthy",
+            "scheduling_agent": "healthy",
+            "interview_agent": "healthy",
+            "database": "healthy"
+        }
+    }
+
+class HealthCheckMiddleware:
+    """Answers GET /health before CORS, routing and response validation run
+    
+    Load balancer probes hit this several times per second per instance, so it is
+    plain ASGI rather than @app.middleware("http"), which wraps every request.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] == "/health" and scope["method"] in ("GET", "HEAD"):
+            await ORJSONResponse(_health_payload())(scope, receive, send)
+            return
+        
+        await self.app(scope, receive, send)
+
 # Create main FastAPI application
 app = FastAPI(
     title="Startup Evaluation Platform",
     description="AI-powered startup evaluation and investment memo generation",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Configure appropriately for production
+    allow_origins=CORS_ALLOWED_ORIGINS,
+    allow_origin_regex=CORS_ORIGIN_REGEX,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
+# Added last so it is outermost and health probes skip the CORS middleware
+app.add_middleware(HealthCheckMiddleware)
+
 # Initialize orchestrator
 project_id = os.getenv("GOOGLE_CLOUD_PROJECT", "your-project-id")
 orchestrator = StartupEvaluationOrchestrator(project_id)
@@ -233,25 +350,19 @@ async def root():
 @app.post("/evaluate-startup")
 async def evaluate_startup_complete(
     startup_data: Dict[str, Any],
-    background_tasks: BackgroundTasks
+    background_tasks: BackgroundTasks,
+    force_refresh: bool = False
 ):
     """Run complete startup evaluation pipeline"""
     
     try:
-        # Validate required fields
-        required_fields = ["startup_info", "founders"]
-        for field in required_fields:
-            if field not in startup_data:
-                raise HTTPException(status_code=400, detail=f"Missing required field: {field}")
-        
-        # Add startup_id if not provided
-        if "startup_id" not in startup_data:
-            startup_data["startup_id"] = f"startup_{int(datetime.utcnow().timestamp())}"
+        _prepare_startup_data(startup_data)
         
         # Run evaluation pipeline in background
         background_tasks.add_task(
             orchestrator.run_complete_evaluation_pipeline,
-            startup_data
+            startup_data,
+            force_refresh
         )
         
         return {
@@ -262,55 +373,43 @@ async def evaluate_startup_complete(
         }
         
     except Exception as e:
-        logger.error(f"Failed to start evaluation: {str(e)}")
+        logger.error("Failed to start evaluation: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/evaluate-startup-sync")
-async def evaluate_startup_sync(startup_data: Dict[str, Any]):
+async def evaluate_startup_sync(startup_data: Dict[str, Any], force_refresh: bool = False):
     """Run complete startup evaluation pipeline synchronously"""
     
     try:
-        # Validate required fields
-        required_fields = ["startup_info", "founders"]
-        for field in required_fields:
-            if field not in startup_data:
-                raise HTTPException(status_code=400, detail=f"Missing required field: {field}")
-        
-        # Add startup_id if not provided
-        if "startup_id" not in startup_data:
-            startup_data["startup_id"] = f"startup_{int(datetime.utcnow().timestamp())}"
+        _prepare_startup_data(startup_data)
         
         # Run evaluation pipeline
-        result = await orchestrator.run_complete_evaluation_pipeline(startup_data)
+        result = await orchestrator.run_complete_evaluation_pipeline(startup_data, force_refresh)
         
         return result
         
     except Exception as e:
-        logger.error(f"Evaluation failed: {str(e)}")
+        logger.error("Evaluation failed: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/health")
-async def health_check():
-    """Detailed health check for all services"""
+@app.post("/evaluate-startup-stream")
+async def evaluate_startup_stream(startup_data: Dict[str, Any], force_refresh: bool = False):
+    """Run complete startup evaluation pipeline, streaming each phase as a Server-Sent Event"""
     
-    health_status = {
-        "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
-        "services": {}
-    }
+    _prepare_startup_data(startup_data)
     
-    try:
-        # Check each agent
-        health_status["services"]["evaluation_agent"] = "healthy"
-        health_status["services"]["scheduling_agent"] = "healthy"
-        health_status["services"]["interview_agent"] = "healthy"
-        health_status["services"]["database"] = "healthy"
-        
-    except Exception as e:
-        health_status["status"] = "unhealthy"
-        health_status["error"] = str(e)
+    async def event_stream():
+        async for event in orchestrator.stream_evaluation_pipeline(startup_data, force_refresh):
+            # orjson output is compact, so the payload never contains the newlines that end an SSE field
+            data = orjson.dumps(event['result'], default=str, option=orjson.OPT_NON_STR_KEYS)
+            yield b"event: " + event['stage'].encode() + b"\ndata: " + data + b"\n\n"
     
-    return health_status
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+@app.get("/health")
+async def health_check():
+    """Detailed health check for all services; normally answered by HealthCheckMiddleware"""
+    return _health_payload()
 
 # Demo endpoint for testing
 @app.post("/demo")
@@ -353,12 +452,24 @@ if __name__ == "__main__":
     host = os.getenv("HOST", "0.0.0.0")
     port = int(os.getenv("PORT", 8000))
     
-    logger.info(f"Starting server on {host}:{port}")
+    # Opt in to more processes with WEB_WORKERS; each worker keeps its own agents, clients, caches and
+    # background workflows. Reload only supports a single process, so DEBUG runs one worker
+    workers = 1 if DEBUG else int(os.getenv("WEB_WORKERS", "1"))
+    
+    # uvloop has lower per-await overhead than the default loop; it is not available on Windows
+    use_uvloop = sys.platform != "win32" and importlib.util.find_spec("uvloop") is not None
+    event_loop = "uvloop" if use_uvloop else "asyncio"
+    
+    logger.info("Starting server on %s:%s (%s event loop, %d workers)", host, port, event_loop, workers)
     
     uvicorn.run(
         "main:app",
         host=host,
         port=port,
-        reload=True,  # Set to False in production
-        log_level="info"
+        loop=event_loop,
+        http="httptools",  # C parser shipped with uvicorn[standard]
+        workers=workers,
+        reload=DEBUG,  # Auto-reload only for local development
+        access_log=DEBUG,  # Per-request access lines are only worth their cost while developing
+        log_level=LOG_LEVEL.lower()
     )